@@ -0,0 +1,389 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local stand-in for the Zendesk API endpoints used by the connector, with configurable latency, page sizes and
+rate limiting, so that the actions can be benchmarked offline"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+API_URI = "/api/v2"
+STATUSES = ["new", "open", "pending", "hold", "solved"]
+PRIORITIES = ["low", "normal", "high", "urgent"]
+FILE_CHUNK_SIZE = 65536
+
+
+class MockZendesk:
+    """Serves generated tickets, users, groups, organizations and ticket fields over HTTP
+
+    latency is added to every request, page_size caps the page sizes the clients ask for, and every
+    rate_limit_every-th request is answered with a 429 asking to retry after retry_after seconds.
+    """
+
+    def __init__(
+        self,
+        tickets=1000,
+        users=200,
+        groups=10,
+        organizations=50,
+        ticket_fields=150,
+        comments_per_ticket=20,
+        attachment_size=1048576,
+        latency=0.0,
+        page_size=100,
+        export_page_size=1000,
+        rate_limit_every=0,
+        retry_after=0,
+        sideloads=True,
+    ):
+        self.latency = latency
+        self.page_size = page_size
+        self.export_page_size = export_page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.sideloads = sideloads
+        self.comments_per_ticket = comments_per_ticket
+        self.attachment_size = attachment_size
+        self.uploaded_bytes = 0
+
+        self.users = {
+            user_id: {"id": user_id, "name": f"User {user_id}", "email": f"user{user_id}@example.com"} for user_id in range(1, users + 1)
+        }
+        self.groups = {group_id: {"id": group_id, "name": f"Group {group_id}"} for group_id in range(1, groups + 1)}
+        self.organizations = {org_id: {"id": org_id, "name": f"Organization {org_id}"} for org_id in range(1, organizations + 1)}
+        self.ticket_fields = [{"id": 1000 + index, "raw_title": f"Field {index}", "type": "text"} for index in range(ticket_fields)]
+        self.tickets = [self._make_ticket(ticket_id) for ticket_id in range(1, tickets + 1)]
+        self._tickets_by_id = {ticket["id"]: ticket for ticket in self.tickets}
+
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.rate_limited = 0
+        self._request_count = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.rate_limited = 0
+
+    def _make_ticket(self, ticket_id):
+        user_count = len(self.users)
+        return {
+            "id": ticket_id,
+            "url": f"https://example.zendesk.com{API_URI}/tickets/{ticket_id}.json",
+            "external_id": None,
+            "type": "incident",
+            "subject": f"Ticket {ticket_id}",
+            "raw_subject": f"Ticket {ticket_id}",
+            "description": f"Description of the ticket {ticket_id}. " * 20,
+            "priority": PRIORITIES[ticket_id % len(PRIORITIES)],
+            "status": STATUSES[ticket_id % len(STATUSES)],
+            "recipient": None,
+            "requester_id": 1 + ticket_id % user_count,
+            "submitter_id": 1 + (ticket_id * 3) % user_count,
+            "assignee_id": 1 + (ticket_id * 7) % user_count,
+            "organization_id": 1 + ticket_id % len(self.organizations) if self.organizations else None,
+            "group_id": 1 + ticket_id % len(self.groups) if self.groups else None,
+            "collaborator_ids": [],
+            "follower_ids": [],
+            "has_incidents": False,
+            "due_at": None,
+            "tags": ["benchmark", f"tag{ticket_id % 20}"],
+            "custom_fields": [{"id": field["id"], "value": None} for field in self.ticket_fields[:10]],
+            "satisfaction_rating": None,
+            "sharing_agreement_ids": [],
+            "brand_id": 1,
+            "allow_channelback": False,
+            "is_public": True,
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": f"2026-01-01T00:{ticket_id // 60 % 60:02d}:{ticket_id % 60:02d}Z",
+            "generated_timestamp": 1767225600 + ticket_id,
+        }
+
+    def _make_comments(self, ticket_id):
+        user_count = len(self.users)
+        return [
+            {
+                "id": ticket_id * 100000 + index,
+                "type": "Comment",
+                "author_id": 1 + (ticket_id + index) % user_count,
+                "body": f"Comment {index} of the ticket {ticket_id}",
+                "html_body": f'<div class="zd-comment"><p>Comment {index} of the ticket {ticket_id}</p></div>',
+                "plain_body": f"Comment {index} of the ticket {ticket_id}",
+                "public": index % 2 == 0,
+                "attachments": [],
+                "audit_id": ticket_id * 100000 + index,
+                "via": {"channel": "web"},
+                "created_at": f"2026-01-01T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}Z",
+            }
+            for index in range(self.comments_per_ticket)
+        ]
+
+    def _next_link(self, handler, path, query, after):
+        query = dict(query, **{"page[after]": str(after)})
+        return f"http://{handler.headers['Host']}{path}?{urlencode(query)}"
+
+    def _cursor_page(self, handler, path, query, items, key):
+        size = min(int(query.get("page[size]", self.page_size)), self.page_size)
+        after = int(query.get("page[after]", 0))
+        page = items[after : after + size]
+        has_more = after + size < len(items)
+        return {
+            key: page,
+            "meta": {"has_more": has_more, "after_cursor": str(after + size) if has_more else None},
+            "links": {"next": self._next_link(handler, path, query, after + size) if has_more else None},
+        }
+
+    def _offset_page(self, query, items, key):
+        per_page = min(int(query.get("per_page", self.page_size)), self.page_size)
+        page = int(query.get("page", 1))
+        return {key: items[(page - 1) * per_page : page * per_page], "count": len(items)}
+
+    def _add_sideloads(self, response, include, tickets):
+        if not self.sideloads or not include:
+            return response
+
+        if "users" in include:
+            user_ids = {ticket.get(key) for ticket in tickets for key in ("requester_id", "submitter_id", "assignee_id")}
+            response["users"] = [self.users[user_id] for user_id in sorted(user_ids) if user_id in self.users]
+        if "groups" in include:
+            response["groups"] = [
+                self.groups[group_id] for group_id in sorted({ticket.get("group_id") for ticket in tickets}) if group_id in self.groups
+            ]
+        if "organizations" in include:
+            org_ids = {ticket.get("organization_id") for ticket in tickets}
+            response["organizations"] = [self.organizations[org_id] for org_id in sorted(org_ids) if org_id in self.organizations]
+
+        return response
+
+    def route(self, handler, method, path, query, body):
+        """Returns the status code, the headers and the JSON body of the response to a request"""
+
+        with self.lock:
+            self._request_count += 1
+            count = self._request_count
+            self.requests[f"{method} {re.sub(r'/[0-9]+', '/{id}', path)}"] += 1
+
+            if self.rate_limit_every and count % self.rate_limit_every == 0:
+                self.rate_limited += 1
+                return 429, {"Retry-After": str(self.retry_after)}, {"error": "TooManyRequests"}
+
+        if path.startswith(API_URI):
+            path = path[len(API_URI) :]
+
+        include = query.get("include", "")
+        full_path = API_URI + path
+
+        if path == "/users/show_many.json":
+            user_ids = [int(user_id) for user_id in query.get("ids", "").split(",") if user_id]
+            return 200, {}, {"users": [self.users[user_id] for user_id in user_ids if user_id in self.users]}
+
+        if path == "/ticket_fields.json":
+            response = self._offset_page(query, self.ticket_fields, "ticket_fields")
+            page = int(query.get("page", 1))
+            per_page = min(int(query.get("per_page", self.page_size)), self.page_size)
+            response["next_page"] = (
+                f"http://{handler.headers['Host']}{full_path}?{urlencode({'page': page + 1, 'per_page': per_page})}"
+                if page * per_page < len(self.ticket_fields)
+                else None
+            )
+            return 200, {}, response
+
+        if path == "/tickets.json" and method == "GET":
+            if "page[size]" in query:
+                response = self._cursor_page(handler, full_path, query, self.tickets, "tickets")
+            else:
+                response = self._offset_page(query, self.tickets, "tickets")
+            return 200, {}, self._add_sideloads(response, include, response["tickets"])
+
+        if path == "/tickets.json" and method == "POST":
+            ticket = dict(self._make_ticket(len(self.tickets) + 1), **json.loads(body)["ticket"])
+            with self.lock:
+                ticket["id"] = len(self.tickets) + 1
+                self.tickets.append(ticket)
+                self._tickets_by_id[ticket["id"]] = ticket
+            return 201, {}, self._add_sideloads({"ticket": ticket}, include, [ticket])
+
+        if path == "/tickets/show_many.json":
+            ticket_ids = [int(ticket_id) for ticket_id in query.get("ids", "").split(",") if ticket_id]
+            tickets = [self._tickets_by_id[ticket_id] for ticket_id in ticket_ids if ticket_id in self._tickets_by_id]
+            return 200, {}, self._add_sideloads({"tickets": tickets}, include, tickets)
+
+        match = re.fullmatch(r"/tickets/([0-9]+)/comments\.json", path)
+        if match:
+            if int(match.group(1)) not in self._tickets_by_id:
+                return 404, {}, {"error": "RecordNotFound", "description": "Not found"}
+            comments = self._make_comments(int(match.group(1)))
+            if query.get("sort") == "-created_at":
+                comments.reverse()
+            response = self._cursor_page(handler, full_path, query, comments, "comments")
+            if self.sideloads and "users" in include:
+                author_ids = sorted({comment["author_id"] for comment in response["comments"]})
+                response["users"] = [self.users[user_id] for user_id in author_ids]
+            return 200, {}, response
+
+        match = re.fullmatch(r"/tickets/([0-9]+)\.json", path)
+        if match:
+            ticket = self._tickets_by_id.get(int(match.group(1)))
+            if ticket is None:
+                return 404, {}, {"error": "RecordNotFound", "description": "Not found"}
+            if method == "PUT":
+                ticket.update(json.loads(body)["ticket"])
+            return 200, {}, self._add_sideloads({"ticket": ticket}, include, [ticket])
+
+        if path == "/uploads.json" and method == "POST":
+            token = query.get("token") or f"token{count}"
+            attachment = {"id": count, "file_name": query.get("filename"), "size": body, "content_type": "application/binary"}
+            return 201, {}, {"upload": {"token": token, "attachment": attachment, "attachments": [attachment]}}
+
+        match = re.fullmatch(r"/attachments/([0-9]+)\.json", path)
+        if match:
+            attachment_id = int(match.group(1))
+            attachment = {
+                "id": attachment_id,
+                "file_name": f"attachment{attachment_id}.bin",
+                "content_url": f"http://{handler.headers['Host']}/attachments/token/{attachment_id}/?name=attachment{attachment_id}.bin",
+                "content_type": "application/octet-stream",
+                "size": self.attachment_size,
+            }
+            return 200, {}, {"attachment": attachment}
+
+        # Every ticket matches the search queries
+        if path == "/search.json":
+            response = self._offset_page(query, self.tickets, "results")
+            return 200, {}, self._add_sideloads(response, include, response["results"])
+
+        if path == "/search/count.json":
+            return 200, {}, {"count": len(self.tickets)}
+
+        if path == "/search/export.json":
+            response = self._cursor_page(handler, full_path, query, self.tickets, "results")
+            return 200, {}, response
+
+        if path == "/incremental/tickets/cursor.json":
+            per_page = min(int(query.get("per_page", self.export_page_size)), self.export_page_size)
+            after = int(query.get("cursor", 0))
+            tickets = self.tickets[after : after + per_page]
+            response = {
+                "tickets": tickets,
+                "after_cursor": str(after + len(tickets)),
+                "end_of_stream": after + per_page >= len(self.tickets),
+            }
+            return 200, {}, self._add_sideloads(response, include, tickets)
+
+        return 404, {}, {"error": "InvalidEndpoint", "description": f"Not found: {method} {path}"}
+
+
+def _make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_args):
+            return
+
+        def _handle(self, method):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+
+            if mock.latency:
+                time.sleep(mock.latency)
+
+            # The files are sent and received in chunks, so that large ones do not weigh on the memory of the benchmark
+            if url.path.startswith("/attachments/token/"):
+                self._send_file(mock.attachment_size)
+                return
+
+            if url.path.endswith("/uploads.json"):
+                body = self._discard_body(length)
+                with mock.lock:
+                    mock.uploaded_bytes += body
+            else:
+                body = self.rfile.read(length) if length else None
+
+            status, headers, response = mock.route(self, method, url.path, query, body)
+
+            payload = json.dumps(response).encode()
+
+            # Like Zendesk, the GET responses carry an ETag and are not sent again if the client has them already
+            etag = None
+            if method == "GET" and status == 200:
+                etag = f'W/"{hashlib.md5(payload).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    status, payload = 304, b""
+
+            self.send_response(status)
+            if payload:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("X-Rate-Limit-Remaining", "700")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _send_file(self, size):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+
+            chunk = b"\0" * FILE_CHUNK_SIZE
+            while size > 0:
+                self.wfile.write(chunk[:size])
+                size -= FILE_CHUNK_SIZE
+
+        def _discard_body(self, length):
+            received = 0
+            while received < length:
+                received += len(self.rfile.read(min(FILE_CHUNK_SIZE, length - received)))
+            return received
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+    return Handler
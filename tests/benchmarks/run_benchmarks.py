@@ -0,0 +1,406 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the connector actions against the local mock Zendesk server
+
+Runs every scenario a number of times and reports the action latency (p50/p95), the throughput, the requests
+made per run and the request latency (p50/p95), e.g.
+
+    python tests/benchmarks/run_benchmarks.py --tickets 5000 --latency 0.05 --rate-limit-every 50
+
+The connector runs outside of the platform, on the same minimal stand-ins of the phantom modules as the unit tests,
+so the numbers only cover the connector and its REST calls. The requests and simplejson packages are needed.
+"""
+
+import argparse
+import json as stdlib_json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_zendesk import MockZendesk
+
+
+class ActionResult:
+    def __init__(self, param=None):
+        self.param = param or {}
+        self.status = False
+        self.message = ""
+        self.data = []
+        self.summary = {}
+
+    def set_status(self, status, message="", *_args, **_kwargs):
+        self.status = status
+        self.message = message
+        return status
+
+    def get_status(self):
+        return self.status
+
+    def get_message(self):
+        return self.message
+
+    def add_data(self, data):
+        self.data.append(data)
+
+    def get_data(self):
+        return self.data
+
+    def set_summary(self, summary):
+        self.summary = summary
+        return summary
+
+    def update_summary(self, summary):
+        self.summary.update(summary)
+        return self.summary
+
+    def get_summary(self):
+        return self.summary
+
+
+class BaseConnector:
+    def __init__(self):
+        self._config = {}
+        self._action = None
+        self._state = {}
+        self._state_dir = None
+        self._results = []
+        self.status = False
+        self.message = ""
+
+    def run(self, action, config, param, state, state_dir):
+        self._config = config
+        self._action = action
+        self._state = state
+        self._state_dir = state_dir
+
+        ret_val = self.initialize()
+        if ret_val:
+            ret_val = self.handle_action(param)
+        self.finalize()
+
+        return ret_val
+
+    def get_config(self):
+        return self._config
+
+    def get_action_identifier(self):
+        return self._action
+
+    def get_asset_id(self):
+        return "benchmark"
+
+    def get_state_dir(self):
+        return self._state_dir
+
+    def load_state(self):
+        return self._state
+
+    def save_state(self, state):
+        self._state = state
+
+    def add_action_result(self, action_result):
+        self._results.append(action_result)
+        return action_result
+
+    def get_action_results(self):
+        return self._results
+
+    def save_progress(self, *_args, **_kwargs):
+        return
+
+    def debug_print(self, *_args, **_kwargs):
+        return
+
+    def set_status(self, status, message="", *_args, **_kwargs):
+        self.status = status
+        self.message = message
+        return status
+
+    def get_status(self):
+        return self.status
+
+    def set_status_save_progress(self, status, message="", *_args, **_kwargs):
+        return self.set_status(status, message)
+
+    def append_to_message(self, message):
+        self.message += message
+
+    def get_container_id(self):
+        return 1
+
+    def is_poll_now(self):
+        return False
+
+    def save_containers(self, containers):
+        return True, "", [(True, "", index) for index, _container in enumerate(containers)]
+
+
+class Vault:
+    """Keeps the files of the vault in a directory, the directory is set by main"""
+
+    directory = None
+
+    @classmethod
+    def get_vault_tmp_dir(cls):
+        return cls.directory
+
+    @classmethod
+    def vault_info(cls, vault_id=None, **_kwargs):
+        path = os.path.join(cls.directory, vault_id)
+        if not os.path.exists(path):
+            return False, "Not found", []
+        return True, "", [{"vault_id": vault_id, "name": vault_id, "path": path, "size": os.path.getsize(path)}]
+
+    @classmethod
+    def vault_add(cls, container=None, file_location=None, file_name=None, **_kwargs):
+        vault_id = f"{container}_{file_name}"
+        os.replace(file_location, os.path.join(cls.directory, vault_id))
+        return True, "", vault_id
+
+
+def _install_phantom_stubs():
+    phantom = types.ModuleType("phantom")
+    app = types.ModuleType("phantom.app")
+    app.APP_SUCCESS = True
+    app.APP_ERROR = False
+    app.APP_JSON_USERNAME = "username"
+    app.APP_JSON_PASSWORD = "password"
+    app.APP_PROG_CONNECTING_TO_ELLIPSES = "Connecting to {0}"
+    app.ACTION_ID_INGEST_ON_POLL = "on_poll"
+    app.ACTION_ID_TEST_ASSET_CONNECTIVITY = "test_asset_connectivity"
+    app.is_fail = lambda status: not status
+    app.is_success = lambda status: bool(status)
+    phantom.app = app
+
+    action_result_module = types.ModuleType("phantom.action_result")
+    action_result_module.ActionResult = ActionResult
+    base_connector_module = types.ModuleType("phantom.base_connector")
+    base_connector_module.BaseConnector = BaseConnector
+    rules_module = types.ModuleType("phantom.rules")
+    rules_module.vault_info = Vault.vault_info
+    rules_module.vault_add = Vault.vault_add
+    vault_module = types.ModuleType("phantom.vault")
+    vault_module.Vault = Vault
+
+    sys.modules["phantom"] = phantom
+    sys.modules["phantom.app"] = app
+    sys.modules["phantom.action_result"] = action_result_module
+    sys.modules["phantom.base_connector"] = base_connector_module
+    sys.modules["phantom.rules"] = rules_module
+    sys.modules["phantom.vault"] = vault_module
+
+
+def _make_connector_class():
+    _install_phantom_stubs()
+
+    from zendesk_connector import ZendeskConnector
+
+    class BenchmarkConnector(ZendeskConnector):
+        """Keeps the duration of every request made by the action"""
+
+        def _reset_metrics(self):
+            super()._reset_metrics()
+            self.request_times = []
+
+        def _record_request(self, endpoint, elapsed, received):
+            super()._record_request(endpoint, elapsed, received)
+            self.request_times.append(elapsed)
+
+    return BenchmarkConnector
+
+
+def _custom_fields(count):
+    return stdlib_json.dumps({"custom_fields": [{f"Field {index}": f"value {index}"} for index in range(count)]})
+
+
+def _scenarios(args):
+    """Returns the scenarios as (name, action identifier, parameter factory), the factory gets the iteration number"""
+
+    ticket_count = args.tickets
+    return [
+        ("list tickets (page)", "list_tickets", lambda _i: {"max_results_per_page": 100}),
+        ("list tickets (fetch all)", "list_tickets", lambda _i: {"fetch_all": True, "max_results_per_page": 100}),
+        ("run query (page)", "run_query", lambda _i: {"query": "status:open", "max_results_per_page": 100}),
+        ("run query (fetch all)", "run_query", lambda _i: {"query": "status:open", "fetch_all": True, "max_results_per_page": 100}),
+        ("run query (count only)", "run_query", lambda _i: {"query": "status:open", "count_only": True}),
+        ("get ticket (hot)", "get_ticket", lambda i: {"id": str(1 + i % 5)}),
+        ("get ticket (x100)", "get_ticket", lambda i: {"id": ",".join(str(1 + (i * 100 + n) % ticket_count) for n in range(100))}),
+        (
+            "create ticket (custom fields)",
+            "create_ticket",
+            lambda i: {"subject": f"Benchmark {i}", "description": "Created by the benchmark", "fields": _custom_fields(5)},
+        ),
+        ("update ticket (custom fields)", "update_ticket", lambda i: {"id": str(1 + i % ticket_count), "fields": _custom_fields(5)}),
+        ("get ticket comments", "get_ticket_comments", lambda i: {"id": str(1 + i % ticket_count)}),
+        ("get ticket comments (since)", "get_ticket_comments", lambda i: {"id": str(1 + i % ticket_count), "since": "2026-01-01T00:08:00Z"}),
+        ("upload attachment", "upload_attachment", lambda _i: {"vault_id": "upload.bin"}),
+        ("download attachment", "download_attachment", lambda i: {"attachment_id": 1 + i}),
+        ("export tickets", "export_tickets", lambda _i: {"start_time": 0, "reset_cursor": True}),
+    ]
+
+
+def _check_scenarios(scenarios):
+    """Fails on the scenario parameters the action does not declare, the connector would silently ignore them"""
+
+    with open(Path(__file__).resolve().parents[2] / "zendesk.json") as app_json:
+        parameters = {action["identifier"]: set(action["parameters"]) for action in stdlib_json.load(app_json)["actions"]}
+
+    for name, action, make_param in scenarios:
+        unknown = set(make_param(0)) - parameters[action]
+        if unknown:
+            raise ValueError(f"Unknown parameters of the '{name}' scenario: {', '.join(sorted(unknown))}")
+
+
+def _percentile(values, percentile):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+def run_scenario(connector_class, mock, config, action, make_param, iterations, state_dir):
+    """Runs an action iterations times, the asset state is kept across the runs like on the platform"""
+
+    state = {}
+    durations = []
+    request_times = []
+    requests = []
+    retries = 0
+    tickets = 0
+    failures = 0
+
+    mock.reset_stats()
+
+    for iteration in range(iterations):
+        connector = connector_class()
+
+        started_at = time.perf_counter()
+        ret_val = connector.run(action, config, make_param(iteration), state, state_dir)
+        durations.append(time.perf_counter() - started_at)
+
+        state = connector._state
+        request_times.extend(connector.request_times)
+        requests.append(len(connector.request_times))
+        retries += connector._metrics["retries"]
+        tickets += sum(len(action_result.get_data()) for action_result in connector.get_action_results())
+        failures += not ret_val
+
+    total_time = sum(durations)
+    return {
+        "iterations": iterations,
+        "failures": failures,
+        "p50": _percentile(durations, 50),
+        "p95": _percentile(durations, 95),
+        "actions_per_second": iterations / total_time if total_time else 0.0,
+        "tickets_per_second": tickets / total_time if total_time else 0.0,
+        "requests_per_run": statistics.mean(requests) if requests else 0.0,
+        "request_p50": _percentile(request_times, 50),
+        "request_p95": _percentile(request_times, 95),
+        "retries": retries,
+        "rate_limited": mock.rate_limited,
+        "endpoints": dict(mock.requests),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=2000, help="Number of tickets served by the mock server")
+    parser.add_argument("--users", type=int, default=500, help="Number of users served by the mock server")
+    parser.add_argument("--comments", type=int, default=20, help="Number of comments of every ticket served by the mock server")
+    parser.add_argument("--attachment-size", type=int, default=1048576, help="Size in bytes of the attachments served and uploaded")
+    parser.add_argument("--ticket-fields", type=int, default=300, help="Number of ticket fields served by the mock server")
+    parser.add_argument("--iterations", type=int, default=10, help="Number of runs of every scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency in seconds added to every request")
+    parser.add_argument("--page-size", type=int, default=100, help="Maximum page size of the mock server")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every n-th request with a 429 (0 to disable)")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After of the 429 responses, in seconds")
+    parser.add_argument("--max-concurrent-requests", type=int, default=1, help="Value of the max_concurrent_requests asset setting")
+    parser.add_argument("--response-cache-size", type=int, default=5120, help="Value of the response_cache_size asset setting, in KB")
+    parser.add_argument("--result-cache-ttl", type=int, default=0, help="Value of the result_cache_ttl asset setting, in seconds")
+    parser.add_argument("--no-sideloads", action="store_true", help="Ignore the include parameter of the requests")
+    parser.add_argument("--scenario", action="append", help="Only run the scenarios whose name contains this text")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    connector_class = _make_connector_class()
+
+    mock = MockZendesk(
+        tickets=args.tickets,
+        users=args.users,
+        ticket_fields=args.ticket_fields,
+        comments_per_ticket=args.comments,
+        attachment_size=args.attachment_size,
+        latency=args.latency,
+        page_size=args.page_size,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        sideloads=not args.no_sideloads,
+    ).start()
+
+    config = {
+        "url": mock.url,
+        "username": "benchmark@example.com",
+        "api_token": "benchmark",
+        "retry_budget": 1000000,
+        "max_concurrent_requests": args.max_concurrent_requests,
+        "response_cache_size": args.response_cache_size,
+        "result_cache_ttl": args.result_cache_ttl,
+    }
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as state_dir:
+            Vault.directory = os.path.join(state_dir, "vault")
+            os.mkdir(Vault.directory)
+            with open(os.path.join(Vault.directory, "upload.bin"), "wb") as upload_file:
+                upload_file.truncate(args.attachment_size)
+
+            scenarios = _scenarios(args)
+            _check_scenarios(scenarios)
+
+            for name, action, make_param in scenarios:
+                if args.scenario and not any(text in name for text in args.scenario):
+                    continue
+                results[name] = run_scenario(connector_class, mock, config, action, make_param, args.iterations, state_dir)
+    finally:
+        mock.stop()
+
+    if args.json:
+        print(stdlib_json.dumps(results, indent=4))
+        return 0
+
+    header = f"{'scenario':<32}{'p50 s':>9}{'p95 s':>9}{'actions/s':>11}{'tickets/s':>11}{'req/run':>9}{'req p50 ms':>12}{'req p95 ms':>12}{'retries':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(
+            f"{name:<32}{result['p50']:>9.3f}{result['p95']:>9.3f}{result['actions_per_second']:>11.1f}{result['tickets_per_second']:>11.0f}"
+            f"{result['requests_per_run']:>9.1f}{result['request_p50'] * 1000:>12.1f}{result['request_p95'] * 1000:>12.1f}{result['retries']:>9}"
+            + (f"  ({result['failures']} failed)" if result["failures"] else "")
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
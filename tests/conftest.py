@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Stand-ins for the platform modules, installed before the connector is imported by the tests"""
+
+import json
+import sys
+import types
+
+import pytest
+
+
+phantom = types.ModuleType("phantom")
+phantom.APP_ERROR = -1
+phantom.APP_SUCCESS = 0
+phantom.APP_PROG_CONNECTING_TO_ELLIPSES = "Connecting to {0}"
+phantom.is_fail = lambda status: status != phantom.APP_SUCCESS
+phantom.app = types.SimpleNamespace(
+    APP_ERROR=phantom.APP_ERROR,
+    APP_PROG_CONNECTING_TO_ELLIPSES=phantom.APP_PROG_CONNECTING_TO_ELLIPSES,
+    APP_SUCCESS=phantom.APP_SUCCESS,
+    is_fail=phantom.is_fail,
+)
+
+
+class ActionResult:
+    """Records what the connector sets on an action result"""
+
+    def __init__(self, param=None):
+        self.param = param
+        self.status = phantom.APP_ERROR
+        self.message = None
+        self.data = []
+        self.summary = {}
+
+    def set_status(self, status, status_message=None, _exception=None, **kwargs):
+        self.status = status
+        self.message = status_message.format(**kwargs) if kwargs else status_message
+        return status
+
+    def get_status(self):
+        return self.status
+
+    def get_message(self):
+        return self.message
+
+    def add_data(self, data):
+        self.data.append(data)
+
+    def get_data(self):
+        return self.data
+
+    def set_summary(self, summary):
+        self.summary = summary
+
+    def update_summary(self, summary):
+        self.summary.update(summary)
+
+    def get_summary(self):
+        return self.summary
+
+
+action_result_module = types.ModuleType("phantom.action_result")
+action_result_module.ActionResult = ActionResult
+
+base_connector_module = types.ModuleType("phantom.base_connector")
+base_connector_module.BaseConnector = object
+
+vault_module = types.ModuleType("phantom.vault")
+vault_module.Vault = object
+
+stub_modules = {
+    "phantom": phantom,
+    "phantom.app": phantom.app,
+    "phantom.action_result": action_result_module,
+    "phantom.base_connector": base_connector_module,
+    "phantom.rules": types.ModuleType("phantom.rules"),
+    "phantom.vault": vault_module,
+    "requests": types.ModuleType("requests"),
+    "simplejson": json,
+}
+
+sys.modules.update(stub_modules)
+
+import zendesk_connector
+
+
+def pytest_collectstart(collector):
+    # test_ticket_id_validation.py installs its own stand-ins when it is imported, the next test modules get these back
+    sys.modules.update(stub_modules)
+
+
+@pytest.fixture(autouse=True)
+def action_result_class(monkeypatch):
+    # test_ticket_id_validation.py also replaces the ActionResult of the connector with a stub lacking the data methods
+    monkeypatch.setattr(zendesk_connector, "ActionResult", ActionResult)
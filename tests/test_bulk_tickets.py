@@ -0,0 +1,205 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import json
+import unittest
+from unittest import mock
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class BulkTicketTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector.get_config = lambda: {}
+        self.connector.debug_print = lambda *_args: None
+        self.connector.save_progress = lambda *_args: None
+        self.connector._add_sideloads = lambda response: None
+        self.connector._add_names_to_ids = lambda tickets: None
+        self.connector._make_rest_call = self.make_rest_call
+        self.action_result = ActionResult()
+        self.connector.add_action_result = lambda _action_result: self.action_result
+        self.calls = []
+        self.missing_ids = set()
+        self.failing_ids = set()
+        self.job_results = []
+
+        patcher = mock.patch.object(zendesk_connector.time, "sleep", lambda _seconds: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_rest_call(self, endpoint, _action_result, params=None, data=None, **_kwargs):
+        self.calls.append((endpoint, params, data))
+
+        if endpoint == "/tickets/show_many.json":
+            ticket_ids = [int(ticket_id) for ticket_id in params["ids"].split(",")]
+            return 0, {"tickets": [{"id": ticket_id, "status": "open"} for ticket_id in ticket_ids if ticket_id not in self.missing_ids]}
+
+        if endpoint == "/tickets/update_many.json":
+            ticket_ids = params["ids"].split(",") if params else [str(ticket["id"]) for ticket in data["tickets"]]
+            self.job_results = [
+                {"id": int(ticket_id), "action": "update", "success": False, "error": "TicketUpdateFailed"}
+                if int(ticket_id) in self.failing_ids
+                else {"id": int(ticket_id), "action": "update", "success": True, "status": "Updated"}
+                for ticket_id in ticket_ids
+            ]
+            return 0, {"job_status": {"id": "job", "status": "queued"}}
+
+        if endpoint == "/job_statuses/job.json":
+            return 0, {"job_status": {"id": "job", "status": "completed", "results": self.job_results}}
+
+        raise AssertionError(f"Unexpected request to {endpoint}")
+
+    def test_gets_tickets_in_chunks_and_reports_the_missing_ones(self):
+        self.missing_ids = {7, 120}
+
+        status = self.connector._get_ticket({"id": ",".join(str(ticket_id) for ticket_id in range(1, 151))})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([len(params["ids"].split(",")) for _endpoint, params, _data in self.calls], [100, 50])
+        self.assertEqual(len(self.action_result.data), 148)
+        self.assertEqual(self.action_result.summary, {"total_tickets": 148, "missing_ticket_ids": ["7", "120"]})
+
+    def test_updates_tickets_with_the_same_fields(self):
+        status = self.connector._update_ticket({"id": "1, 2, 3", "fields": '{"status": "solved"}'})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(self.calls[0], ("/tickets/update_many.json", {"ids": "1,2,3"}, {"ticket": {"status": "solved"}}))
+        self.assertEqual(self.action_result.summary, {"updated_tickets": 3, "failed_ticket_ids": []})
+        self.assertEqual([ticket["id"] for ticket in self.action_result.data], [1, 2, 3])
+
+    def test_updates_every_ticket_with_its_own_fields_and_reports_the_failed_ones(self):
+        self.failing_ids = {2}
+
+        status = self.connector._update_ticket({"id": "[1, 2]", "fields": json.dumps([{"status": "solved"}, {"priority": "high"}])})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertIsNone(self.calls[0][1])
+        self.assertEqual(self.calls[0][2], {"tickets": [{"status": "solved", "id": 1}, {"priority": "high", "id": 2}]})
+        self.assertEqual(self.action_result.summary, {"updated_tickets": 1, "failed_ticket_ids": ["2"]})
+        self.assertIn("2", self.action_result.message)
+
+        # Only the updated tickets are fetched again
+        self.assertEqual(self.calls[-1][1]["ids"], "1")
+        self.assertEqual([ticket["id"] for ticket in self.action_result.data], [1])
+
+    def test_rejects_a_field_list_not_matching_the_ids(self):
+        status = self.connector._update_ticket({"id": "1,2", "fields": json.dumps([{"status": "solved"}])})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.calls, [])
+
+
+class CreateTicketsTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector.debug_print = lambda *_args: None
+        self.connector.save_progress = lambda *_args: None
+        self.connector._make_rest_call = self.make_rest_call
+        self.action_result = ActionResult()
+        self.connector.add_action_result = lambda _action_result: self.action_result
+        self.chunks = []
+        self.failing_subjects = set()
+
+    def make_rest_call(self, endpoint, _action_result, data=None, **_kwargs):
+        if endpoint == "/tickets/create_many.json":
+            self.chunks.append(data["tickets"])
+            return 0, {"job_status": {"id": "job", "status": "queued"}}
+
+        # The results hold the index of every ticket within its chunk
+        results = [
+            {"index": index, "error": "InvalidValue", "details": "Requester is invalid"}
+            if ticket["subject"] in self.failing_subjects
+            else {"index": index, "id": 1000 + len(self.chunks) * 100 + index}
+            for index, ticket in enumerate(self.chunks[-1])
+        ]
+        return 0, {"job_status": {"id": "job", "status": "completed", "results": results}}
+
+    def test_creates_tickets_in_chunks(self):
+        specs = [{"subject": f"Ticket {index}", "description": "Created in bulk", "priority": "high"} for index in range(150)]
+
+        status = self.connector._create_tickets({"tickets": json.dumps(specs)})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([len(chunk) for chunk in self.chunks], [100, 50])
+        self.assertEqual(self.chunks[0][0], {"subject": "Ticket 0", "comment": {"body": "Created in bulk"}, "priority": "high"})
+        self.assertEqual([data["index"] for data in self.action_result.data], list(range(150)))
+        self.assertEqual(self.action_result.summary, {"created_tickets": 150, "failed_tickets": 0})
+
+    def test_reports_the_failed_tickets_at_their_position_in_the_whole_list(self):
+        self.failing_subjects = {"Ticket 103"}
+        specs = [{"subject": f"Ticket {index}", "description": "Created in bulk"} for index in range(110)]
+
+        status = self.connector._create_tickets({"tickets": json.dumps(specs)})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.action_result.summary, {"created_tickets": 109, "failed_tickets": 1})
+        self.assertEqual(
+            self.action_result.data[103], {"index": 103, "id": None, "success": False, "error": "InvalidValue: Requester is invalid"}
+        )
+        self.assertEqual(self.action_result.data[104], {"index": 104, "id": 1204, "success": True, "error": None})
+
+    def test_rejects_tickets_without_subject_or_description(self):
+        status = self.connector._create_tickets({"tickets": json.dumps([{"subject": "No description"}])})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.chunks, [])
+
+
+class WaitForJobTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.sleeps = []
+        self.statuses = []
+
+        patcher = mock.patch.object(zendesk_connector.time, "sleep", self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_rest_call(self, endpoint, _action_result, **_kwargs):
+        return 0, {"job_status": self.statuses.pop(0)}
+
+    def test_polls_with_an_increasing_interval_until_the_job_is_done(self):
+        self.connector._make_rest_call = self.make_rest_call
+        self.statuses = [
+            {"id": "job", "status": "working"},
+            {"id": "job", "status": "working"},
+            {"id": "job", "status": "completed", "results": []},
+        ]
+
+        status, job_status = self.connector._wait_for_job(ActionResult(), {"id": "job", "status": "queued"})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(job_status["status"], "completed")
+        self.assertEqual(self.sleeps, [1, 2, 4])
+
+    def test_fails_when_the_job_fails(self):
+        self.connector._make_rest_call = self.make_rest_call
+        self.statuses = [{"id": "job", "status": "failed"}]
+        action_result = ActionResult()
+
+        status, job_status = self.connector._wait_for_job(action_result, {"id": "job", "status": "queued"})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertIsNone(job_status)
+        self.assertIn("job", action_result.message)
+
+
+if __name__ == "__main__":
+    unittest.main()
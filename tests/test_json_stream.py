@@ -0,0 +1,63 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import json
+import unittest
+
+import zendesk_connector
+
+
+class JsonStreamTest(unittest.TestCase):
+    def _decode(self, body, chunk_size):
+        encoded = body.encode("utf-8")
+        return zendesk_connector._JsonStream(encoded[index : index + chunk_size] for index in range(0, len(encoded), chunk_size)).decode()
+
+    def test_decodes_like_the_whole_body_whatever_the_chunk_size(self):
+        body = json.dumps(
+            {
+                "tickets": [
+                    {"id": 1234567, "subject": "caf\u00e9 \u2603", "tags": ["a", "b"], "via": {"channel": "web"}},
+                    {"id": 2, "score": 1.5e3},
+                ],
+                "users": [],
+                "next_page": None,
+                "count": 1234567890,
+                "meta": {"has_more": True},
+            },
+            indent=1,
+        )
+
+        for chunk_size in (1, 2, 3, 7, 64, len(body)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self._decode(body, chunk_size), json.loads(body))
+
+        self.assertEqual(self._decode("{}", 1), {})
+
+    def test_decodes_numbers_split_between_chunks(self):
+        body = '{"tickets": [3.5e-07, -12, 1E+3], "count": 0.25}'
+
+        for split in range(1, len(body)):
+            with self.subTest(split=split):
+                chunks = [body[:split].encode(), body[split:].encode()]
+                self.assertEqual(zendesk_connector._JsonStream(chunks).decode(), json.loads(body))
+
+    def test_rejects_invalid_bodies(self):
+        for body in ('{"tickets": [1, 2', "[1, 2]", '{"count": 1 "a": 2}', ""):
+            with self.subTest(body=body):
+                with self.assertRaises(ValueError):
+                    self._decode(body, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
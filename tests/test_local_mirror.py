@@ -0,0 +1,207 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import json
+import os
+import tempfile
+import unittest
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class LocalMirrorTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._mirror = None
+        self.connector._mirror_file = os.path.join(directory.name, "tickets.db")
+        self.connector._mirror_max_age = 300
+        self.connector.debug_print = lambda *_args: None
+        self.connector.get_config = lambda: {}
+        self.connector._follow_ticket_export = self._follow_ticket_export
+        self.addCleanup(lambda: self.connector._mirror and self.connector._mirror.close())
+
+        self.pages = [
+            [
+                {"id": 1, "status": "open", "priority": "high", "requester_id": 7, "updated_at": "2026-01-01T10:00:00Z", "tags": ["phishing"]},
+                {"id": 2, "status": "pending", "priority": "low", "requester_id": 8, "updated_at": "2026-01-02T10:00:00Z", "tags": []},
+                {
+                    "id": 3,
+                    "status": "solved",
+                    "priority": "urgent",
+                    "requester_id": 7,
+                    "updated_at": "2026-01-03T10:00:00Z",
+                    "tags": ["phishing"],
+                },
+            ],
+            [
+                {"id": 2, "status": "deleted", "updated_at": "2026-01-04T10:00:00Z"},
+                {"id": 4, "status": "new", "priority": "normal", "requester_id": 8, "updated_at": "2026-01-05T10:00:00Z", "tags": ["spam"]},
+            ],
+        ]
+        self.cursors = []
+        self.end_of_stream = True
+
+    def _follow_ticket_export(self, _action_result, cursor, _start_time, _max_results, handle_page, per_page=None):
+        self.cursors.append(cursor)
+        for page in self.pages:
+            handle_page(page)
+        return phantom.APP_SUCCESS, "cursor 2", self.end_of_stream, sum(len(page) for page in self.pages)
+
+    def query(self, query, **param):
+        action_result = ActionResult()
+        status, answered = self.connector._run_local_query({"query": query, **param}, action_result, None)
+        return status, answered, action_result
+
+    def test_filters_the_mirrored_tickets(self):
+        _status, answered, action_result = self.query("type:ticket status<solved")
+
+        self.assertTrue(answered)
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [4, 1])
+        self.assertEqual(action_result.summary["source"], "local mirror")
+
+        _status, _answered, action_result = self.query("tags:phishing requester:7 priority>=high updated<2026-01-03")
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [1])
+
+        _status, _answered, action_result = self.query("status:new status:solved updated:2026-01-03")
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [3])
+
+        _status, _answered, action_result = self.query("updated>1days")
+        self.assertEqual(action_result.data, [])
+
+    def test_pages_through_the_results(self):
+        _status, _answered, action_result = self.query("type:ticket", max_results_per_page=2, page_number=2)
+
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [1])
+        self.assertEqual(action_result.summary["total_tickets"], 3)
+        self.assertEqual(action_result.summary["returned_tickets"], 1)
+
+        _status, _answered, action_result = self.query("type:ticket", count_only=True)
+
+        self.assertEqual(action_result.data, [])
+        self.assertEqual(action_result.summary["total_tickets"], 3)
+
+    def test_syncs_only_when_the_mirror_is_too_old(self):
+        self.query("status:open")
+        self.query("status:open")
+
+        self.assertEqual(self.cursors, [None])
+
+        self.connector._mirror_max_age = 0
+        self.query("status:open")
+
+        self.assertEqual(self.cursors, [None, "cursor 2"])
+
+    def test_falls_back_to_zendesk_when_the_sync_is_incomplete(self):
+        self.end_of_stream = False
+
+        _status, answered, _action_result = self.query("status:open")
+        self.assertFalse(answered)
+
+        # The stored pages are kept, the next sync continues from their cursor
+        self.end_of_stream = True
+        _status, answered, _action_result = self.query("status:open")
+
+        self.assertTrue(answered)
+        self.assertEqual(self.cursors, [None, "cursor 2"])
+
+    def test_rejects_queries_it_cannot_answer(self):
+        status, answered, action_result = self.query("subject:invoice")
+
+        self.assertTrue(answered)
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(action_result.message, zendesk_connector.consts.ZENDESK_ERR_LOCAL_QUERY)
+        self.assertEqual(self.cursors, [])
+
+
+class Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {}
+        self.body = body
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return self.body
+
+    def close(self):
+        return
+
+
+class MirrorSyncFailureTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._mirror = None
+        self.connector._mirror_file = os.path.join(directory.name, "tickets.db")
+        self.connector._mirror_max_age = 300
+        self.connector._max_concurrent_requests = 1
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._auth_method = "api token"
+        self.connector._retries_left = 3
+        self.connector._rate_limit_reset_at = 0
+        self.connector._requests_per_minute = 0
+        self.connector._response_cache_size = 0
+        self.connector._timeout = (10, 60)
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._progress_reported_at = None
+        self.connector._group_names = {}
+        self.connector._organization_names = {}
+        self.connector._ZendeskConnector__id_to_name = {}
+        self.connector._session = self
+        self.connector.save_progress = lambda *_args, **_kwargs: None
+        self.connector.debug_print = lambda *_args, **_kwargs: None
+        self.connector.get_config = lambda: {}
+        self.action_result = None
+        self.connector.add_action_result = self.add_action_result
+        self.addCleanup(lambda: self.connector._mirror and self.connector._mirror.close())
+        self.urls = []
+
+    def add_action_result(self, action_result):
+        self.action_result = action_result
+        return action_result
+
+    def get(self, url, **_kwargs):
+        self.urls.append(url)
+
+        # The incremental export is only allowed to admins
+        if url.endswith("/incremental/tickets/cursor.json"):
+            return Response(403, {"error": "Forbidden", "description": "You do not have access to this page"})
+
+        return Response(200, {"results": [{"id": 1, "status": "open"}], "count": 1})
+
+    def test_falls_back_to_zendesk_with_a_clean_result_when_the_sync_fails(self):
+        status = self.connector._run_query({"query": "status:open", "query_local": True})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([url.rsplit("/", 1)[-1] for url in self.urls], ["cursor.json", "search.json"])
+        self.assertEqual(self.action_result.data, [{"id": 1, "status": "open"}])
+        self.assertEqual(self.action_result.summary, {"source": "zendesk", "total_tickets": 1, "returned_tickets": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
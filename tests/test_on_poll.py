@@ -0,0 +1,118 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import unittest
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class OnPollTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._state = {"poll_cursor": "saved"}
+        self.connector._deadline_reached = False
+        self.connector.get_config = lambda: {"poll_max_tickets": 3}
+        self.connector.is_poll_now = lambda: False
+        self.connector.debug_print = lambda *_args: None
+        self.connector.save_progress = lambda *_args: None
+        self.connector.save_containers = self.save_containers
+        self.connector._follow_ticket_export = self.follow_ticket_export
+        self.action_result = ActionResult()
+        self.connector.add_action_result = lambda _action_result: self.action_result
+        self.saved_containers = []
+        self.save_error = None
+        self.export_calls = []
+
+        # The second page repeats a ticket version of the first one, along with a newer version of it
+        self.pages = [
+            [{"id": 1, "updated_at": "2026-01-01T00:00:00Z", "priority": "urgent"}, {"id": 2, "updated_at": "2026-01-01T00:00:00Z"}],
+            [{"id": 2, "updated_at": "2026-01-01T00:00:00Z"}, {"id": 2, "updated_at": "2026-01-02T00:00:00Z", "subject": "Updated"}],
+        ]
+
+    def save_containers(self, containers):
+        if self.save_error:
+            return phantom.APP_ERROR, self.save_error, []
+        self.saved_containers.extend(containers)
+        return phantom.APP_SUCCESS, "", []
+
+    def follow_ticket_export(self, _action_result, cursor, start_time, max_results, handle_page, per_page=None):
+        self.export_calls.append({"cursor": cursor, "start_time": start_time, "max_results": max_results, "per_page": per_page})
+        total = 0
+        for page in self.pages:
+            if phantom.is_fail(handle_page(page)):
+                return phantom.APP_ERROR, cursor, False, total
+            total += len(page)
+        return phantom.APP_SUCCESS, "new", True, total
+
+    def test_ingests_every_ticket_version_once_and_moves_the_checkpoint(self):
+        status = self.connector._on_poll({})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(
+            [container["artifacts"][0]["source_data_identifier"] for container in self.saved_containers],
+            ["1_2026-01-01T00:00:00Z", "2_2026-01-01T00:00:00Z", "2_2026-01-02T00:00:00Z"],
+        )
+        self.assertEqual(self.saved_containers[0]["severity"], "high")
+        self.assertEqual(self.saved_containers[2]["name"], "Zendesk ticket 2: Updated")
+        self.assertEqual(self.export_calls[0]["cursor"], "saved")
+        self.assertEqual(self.connector._state["poll_cursor"], "new")
+
+    def test_caps_the_pages_at_the_ticket_limit(self):
+        self.connector._on_poll({})
+
+        self.assertEqual(self.export_calls[0]["max_results"], 3)
+        self.assertEqual(self.export_calls[0]["per_page"], 3)
+
+    def test_poll_now_does_not_move_the_checkpoint(self):
+        self.connector.is_poll_now = lambda: True
+
+        status = self.connector._on_poll({"container_count": 2})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(self.export_calls[0]["max_results"], 2)
+        self.assertEqual(self.connector._state["poll_cursor"], "saved")
+
+    def test_keeps_the_checkpoint_when_containers_cannot_be_saved(self):
+        self.save_error = "Disk full"
+
+        status = self.connector._on_poll({})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.action_result.message, "Unable to save the ingested tickets, Error: Disk full")
+        self.assertEqual(self.connector._state["poll_cursor"], "saved")
+
+    def test_starts_the_first_poll_from_the_configured_days(self):
+        self.connector._state = {}
+        self.connector.get_config = lambda: {"poll_first_run_days": 2}
+
+        before = int(zendesk_connector.time.time())
+        self.connector._on_poll({})
+
+        self.assertIsNone(self.export_calls[0]["cursor"])
+        self.assertAlmostEqual(self.export_calls[0]["start_time"], before - 2 * 86400, delta=1)
+
+        # The incremental export rejects a start time this recent
+        self.connector.get_config = lambda: {"poll_first_run_days": 0}
+
+        status = self.connector._on_poll({})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(len(self.export_calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
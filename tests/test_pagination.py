@@ -0,0 +1,266 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import unittest
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class CursorPaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._progress_reported_at = None
+        self.connector._add_names_to_ids = lambda tickets: self.enriched.append(len(tickets))
+        self.enriched = []
+        self.calls = []
+
+    def _pages(self, next_link):
+        def make_rest_call(endpoint, _action_result, params=None, **_kwargs):
+            self.calls.append((endpoint, params))
+            after = int(params.get("page[after]", 0))
+            return 0, {
+                "tickets": [{"id": ticket_id} for ticket_id in range(after, after + 2)],
+                "meta": {"has_more": after < 4},
+                "links": {"next": next_link.format(after=after + 2)},
+            }
+
+        return make_rest_call
+
+    def test_streams_every_page_until_cap(self):
+        self.connector._make_rest_call = self._pages("https://example.zendesk.com/api/v2/tickets.json?page%5Bsize%5D=2&page%5Bafter%5D={after}")
+        action_result = ActionResult()
+
+        status, total = self.connector._add_all_pages(action_result, "/tickets.json", {"page[size]": 2}, "tickets", max_results=5)
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(total, 5)
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [0, 1, 2, 3, 4])
+        self.assertEqual(self.enriched, [2, 2, 1])
+        self.assertEqual(self.calls[1], ("/tickets.json", {"page[size]": "2", "page[after]": "2"}))
+
+    def test_prefetches_next_page_when_concurrent_requests_are_enabled(self):
+        self.connector._make_rest_call = self._pages("https://example.zendesk.com/api/v2/tickets.json?page%5Bsize%5D=2&page%5Bafter%5D={after}")
+        self.connector._max_concurrent_requests = 2
+        self.addCleanup(lambda: self.connector._executor.shutdown())
+        action_result = ActionResult()
+
+        status, total = self.connector._add_all_pages(action_result, "/tickets.json", {"page[size]": 2}, "tickets", max_results=5)
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(total, 5)
+        self.assertEqual([ticket["id"] for ticket in action_result.data], [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.calls), 3)
+
+    def test_returns_partial_results_at_deadline(self):
+        self.connector._make_rest_call = self._pages("https://example.zendesk.com/api/v2/tickets.json?page%5Bsize%5D=2&page%5Bafter%5D={after}")
+        self.connector._deadline = zendesk_connector.time.time() - 1
+        action_result = ActionResult()
+
+        status, total = self.connector._add_all_pages(action_result, "/tickets.json", {"page[size]": 2}, "tickets")
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(total, 2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(self.connector._deadline_reached)
+
+    def test_rejects_next_links_to_other_hosts(self):
+        self.connector._make_rest_call = self._pages("https://attacker.example.com/api/v2/tickets.json?page%5Bafter%5D={after}")
+        action_result = ActionResult()
+
+        status, total = self.connector._add_all_pages(action_result, "/tickets.json", {"page[size]": 2}, "tickets")
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(total, 2)
+        self.assertEqual(action_result.message, "Unable to safely retrieve the next page of results")
+        self.assertEqual(len(self.calls), 1)
+
+
+class FieldProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector.get_config = lambda: {"default_fields_to_return": "status"}
+        self.ticket = {"id": 1, "subject": "s", "status": "open", "assignee_id": 2, "assignee_id_name": "user 2", "requester_id_name": "user 3"}
+
+    def test_trims_tickets_to_requested_keys(self):
+        action_result = ActionResult()
+
+        fields_to_return = self.connector._get_fields_to_return({"fields_to_return": "subject, assignee_id,"})
+        self.connector._add_tickets(action_result, [self.ticket], fields_to_return)
+
+        self.assertEqual(action_result.data, [{"id": 1, "subject": "s", "assignee_id": 2, "assignee_id_name": "user 2"}])
+
+    def test_uses_asset_default_and_passes_tickets_through_without_projection(self):
+        self.assertEqual(self.connector._get_fields_to_return({}), {"status"})
+
+        self.connector.get_config = lambda: {}
+        action_result = ActionResult()
+
+        self.connector._add_tickets(action_result, [self.ticket], self.connector._get_fields_to_return({}))
+
+        self.assertIs(action_result.data[0], self.ticket)
+
+
+class CommentPaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._max_concurrent_requests = 1
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._add_sideloads = lambda response: None
+        self.calls = []
+
+    def make_rest_call(self, endpoint, _action_result, params=None, **_kwargs):
+        # Ten comments, the most recent one first, two per page
+        self.calls.append(params)
+        after = int(params.get("page[after]", 0))
+        return 0, {
+            "comments": [
+                {"id": comment_id, "created_at": f"2026-01-01T00:00:{comment_id:02d}Z"} for comment_id in range(10 - after, 8 - after, -1)
+            ],
+            "meta": {"has_more": after < 8},
+            "links": {"next": f"https://example.zendesk.com/api/v2{endpoint}?page%5Bsize%5D=2&sort=-created_at&page%5Bafter%5D={after + 2}"},
+        }
+
+    def test_only_fetches_the_pages_of_the_new_comments(self):
+        self.connector._make_rest_call = self.make_rest_call
+
+        status, comments = self.connector._fetch_comments(ActionResult(), "/tickets/1/comments.json", since_id=6)
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([comment["id"] for comment in comments], [7, 8, 9, 10])
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.calls[0]["sort"], "-created_at")
+        self.assertEqual(self.calls[1]["include"], "users")
+
+    def test_compares_timestamps_of_the_comments(self):
+        self.connector._make_rest_call = self.make_rest_call
+
+        status, since_id, since_time = self.connector._get_since({"since": "2026-01-01T00:00:07"}, ActionResult())
+        _status, comments = self.connector._fetch_comments(ActionResult(), "/tickets/1/comments.json", since_id, since_time)
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([comment["id"] for comment in comments], [8, 9, 10])
+
+        status, _since_id, _since_time = self.connector._get_since({"since": "last week"}, ActionResult())
+
+        self.assertEqual(status, phantom.APP_ERROR)
+
+    def test_stops_at_max_results_without_since(self):
+        self.connector._make_rest_call = self.make_rest_call
+
+        _status, comments = self.connector._fetch_comments(ActionResult(), "/tickets/1/comments.json", max_results=3)
+
+        self.assertEqual([comment["id"] for comment in comments], [7, 8, 9, 10])
+        self.assertEqual(len(self.calls), 2)
+
+
+class ExportCursorTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._max_concurrent_requests = 1
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._state = {"export_cursor": "saved"}
+        self.connector.get_config = lambda: {}
+        self.connector.debug_print = lambda *_args: None
+        self.connector._add_sideloads = lambda response: None
+        self.connector._add_names_to_ids = lambda tickets: None
+        self.connector._make_rest_call = self.make_rest_call
+        self.action_result = ActionResult()
+        self.connector.add_action_result = lambda _action_result: self.action_result
+        self.calls = []
+        self.failing_cursor = "never requested"
+
+    def make_rest_call(self, endpoint, action_result, params=None, **_kwargs):
+        # Two pages of two tickets, from the start time or from the saved cursor alike
+        self.calls.append(params)
+        cursor = params.get("cursor")
+        if cursor == self.failing_cursor:
+            return action_result.set_status(phantom.APP_ERROR, "Error from server"), None
+        if cursor == "page 2":
+            return 0, {"tickets": [{"id": 3}, {"id": 4}], "after_cursor": "page 3", "end_of_stream": True}
+        return 0, {"tickets": [{"id": 1}, {"id": 2}], "after_cursor": "page 2", "end_of_stream": False}
+
+    def test_saves_the_cursor_of_the_last_page_after_success(self):
+        status = self.connector._export_tickets({})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual([ticket["id"] for ticket in self.action_result.data], [1, 2, 3, 4])
+        self.assertEqual(self.calls[0]["cursor"], "saved")
+        self.assertEqual(self.connector._state["export_cursor"], "page 3")
+        self.assertEqual(self.action_result.summary, {"total_tickets": 4, "end_of_stream": True})
+
+    def test_leaves_the_cursor_unchanged_on_failure(self):
+        self.failing_cursor = "page 2"
+
+        status = self.connector._export_tickets({})
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.connector._state["export_cursor"], "saved")
+
+    def test_starts_over_from_the_start_time_on_reset(self):
+        self.connector._export_tickets({"start_time": 1700000000, "reset_cursor": True})
+
+        self.assertNotIn("cursor", self.calls[0])
+        self.assertEqual(self.calls[0]["start_time"], 1700000000)
+        self.assertEqual(self.connector._state["export_cursor"], "page 3")
+
+    def test_stops_after_the_page_reaching_max_results(self):
+        status = self.connector._export_tickets({"max_results": 1})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(len(self.calls), 1)
+        # The whole page is returned, so that the saved cursor does not skip any ticket
+        self.assertEqual([ticket["id"] for ticket in self.action_result.data], [1, 2])
+        self.assertEqual(self.connector._state["export_cursor"], "page 2")
+        self.assertEqual(self.action_result.summary["end_of_stream"], False)
+
+
+class CountOnlyTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector.get_config = lambda: {}
+        self.connector._add_names_to_ids = lambda tickets: self.fail("No ticket should be enriched")
+        self.calls = []
+
+    def make_rest_call(self, endpoint, _action_result, params=None, **_kwargs):
+        self.calls.append((endpoint, params))
+        return 0, {"count": 42}
+
+    def test_only_requests_the_count(self):
+        self.connector._make_rest_call = self.make_rest_call
+        action_result = ActionResult()
+        self.connector.add_action_result = lambda _action_result: action_result
+
+        status = self.connector._run_query({"query": "status:open tags:host-1", "count_only": True})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(self.calls, [("/search/count.json", {"query": "type:ticket status:open tags:host-1"})])
+        self.assertEqual(action_result.summary, {"total_tickets": 42, "returned_tickets": 0})
+        self.assertEqual(action_result.data, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,381 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class Response:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body if body is not None else {}
+        self.content = json.dumps(self.body).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return self.body
+
+    def close(self):
+        return
+
+
+class Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.sent_headers = []
+        self.bodies = []
+
+    def request(self, *_args, **kwargs):
+        self.calls += 1
+        self.timeout = kwargs.get("timeout")
+        self.sent_headers.append(dict(kwargs.get("headers") or {}))
+        body = kwargs.get("data")
+        self.bodies.append(body.read() if hasattr(body, "read") else body)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    get = put = post = request
+
+
+class RestCallRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._auth_method = "api token"
+        self.connector._retries_left = 3
+        self.connector._rate_limit_reset_at = 0
+        self.connector._requests_per_minute = 0
+        self.connector._timeout = (10, 60)
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._progress_reported_at = None
+        self.connector.save_progress = lambda *_args, **_kwargs: None
+        self.connector.debug_print = lambda *_args, **_kwargs: None
+        self.sleeps = []
+
+        patcher = mock.patch.object(zendesk_connector.time, "sleep", self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_honors_retry_after_on_rate_limited_request(self):
+        self.connector._session = Session([Response(429, {"Retry-After": "7"}), Response(200, body={"ticket": {}})])
+
+        status, response = self.connector._make_rest_call("/tickets/1.json", ActionResult(), method="post")
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(response, {"ticket": {}})
+        self.assertEqual(self.sleeps, [7.0])
+        self.assertEqual(self.connector._retries_left, 2)
+        self.assertEqual(self.connector._metrics["requests"], 2)
+        self.assertEqual(self.connector._metrics["retries"], 1)
+        self.assertEqual(self.connector._metrics["bytes_received"], len(b'{"ticket": {}}') + 2)
+        self.assertEqual(self.connector._metrics["endpoints"]["tickets"]["requests"], 2)
+
+    def test_retries_server_errors_only_for_get(self):
+        self.connector._session = Session([Response(503), Response(200)])
+
+        status, _response = self.connector._make_rest_call("/tickets.json", ActionResult())
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertTrue(0.5 <= self.sleeps[0] <= 1)
+
+        self.connector._session = Session([Response(503), Response(200)])
+
+        status, _response = self.connector._make_rest_call("/tickets.json", ActionResult(), method="put")
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.connector._session.calls, 1)
+
+    def test_stops_retrying_when_budget_is_spent(self):
+        self.connector._session = Session([OSError("reset")] * 5)
+
+        action_result = ActionResult()
+        status, _response = self.connector._make_rest_call("/tickets.json", action_result)
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(action_result.message, "Connection failed")
+        self.assertEqual(self.connector._session.calls, 4)
+        self.assertEqual(self.connector._retries_left, 0)
+
+    def test_does_not_wait_for_long_retry_after(self):
+        self.connector._session = Session([Response(429, {"Retry-After": "3600"})])
+
+        status, _response = self.connector._make_rest_call("/tickets.json", ActionResult())
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(self.sleeps, [])
+
+    def test_waits_for_quota_reset_when_remaining_is_exhausted(self):
+        self.connector._session = Session([Response(200, {"X-Rate-Limit-Remaining": "0", "ratelimit-reset": "5"}), Response(200)])
+
+        self.connector._make_rest_call("/tickets.json", ActionResult())
+        self.connector._make_rest_call("/tickets.json", ActionResult())
+
+        self.assertEqual(self.connector._metrics["rate_limit_remaining"], 0)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertTrue(4 < self.sleeps[0] <= 5)
+
+    def test_bounds_requests_by_the_action_deadline(self):
+        self.connector._session = Session([Response(503), Response(200)])
+        self.connector._deadline = zendesk_connector.time.time() + 30
+
+        status, _response = self.connector._make_rest_call("/tickets.json", ActionResult())
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(self.connector._session.timeout[0], 10)
+        self.assertTrue(29 < self.connector._session.timeout[1] <= 30)
+
+        self.connector._deadline = zendesk_connector.time.time() - 1
+        action_result = ActionResult()
+
+        status, _response = self.connector._make_rest_call("/tickets.json", action_result)
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(action_result.message, "The action deadline was reached before the request could be made")
+        self.assertEqual(self.connector._session.calls, 2)
+        self.assertTrue(self.connector._deadline_reached)
+
+    def test_stops_attachment_downloads_at_the_deadline(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.connector._deadline = zendesk_connector.time.time() + 30
+
+        def iter_content(chunk_size):
+            yield b"first chunk"
+            # The download is still going when the deadline is reached
+            self.connector._deadline = zendesk_connector.time.time() - 1
+            yield b"second chunk"
+
+        download = mock.MagicMock(ok=True, headers={}, iter_content=iter_content)
+        download.__enter__.return_value = download
+        self.connector._session = mock.Mock(get=mock.Mock(return_value=download))
+
+        with mock.patch.object(zendesk_connector, "Vault", mock.Mock(get_vault_tmp_dir=lambda: tmp_dir.name)):
+            action_result = ActionResult()
+            status, vault_id, size = self.connector._download_to_vault(
+                action_result, "https://example.zendesk.com/attachments/token/abc/?name=a.pcap", "a.pcap"
+            )
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual((vault_id, size), (None, 0))
+        self.assertEqual(action_result.message, "The action deadline was reached before the attachment was downloaded")
+        self.assertTrue(29 < self.connector._session.get.call_args.kwargs["timeout"][1] <= 30)
+        self.assertEqual(zendesk_connector.os.listdir(tmp_dir.name), [])
+        self.assertTrue(self.connector._deadline_reached)
+
+    def test_sends_the_whole_file_again_when_an_upload_is_retried(self):
+        self.connector._session = Session([Response(429, {"Retry-After": "1"}), Response(201, body={"upload": {"token": "abc"}})])
+
+        with tempfile.TemporaryFile() as upload_file:
+            upload_file.write(b"evidence")
+            status, response = self.connector._make_rest_call(
+                "/uploads.json", ActionResult(), params={"filename": "evidence.txt"}, method="post", upload_file=upload_file
+            )
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(response, {"upload": {"token": "abc"}})
+        self.assertEqual(self.connector._session.bodies, [b"evidence", b"evidence"])
+        self.assertEqual(self.connector._session.sent_headers[0], {"Content-Type": "application/binary"})
+
+    def test_only_sends_credentials_to_zendesk_hosts(self):
+        self.assertTrue(self.connector._is_zendesk_url("https://example.zendesk.com/attachments/token/abc/?name=a.pcap"))
+        self.assertTrue(self.connector._is_zendesk_url("https://other.zendesk.com/attachments/token/abc/?name=a.pcap"))
+        self.assertFalse(self.connector._is_zendesk_url("http://other.zendesk.com/attachments/token/abc/?name=a.pcap"))
+        self.assertFalse(self.connector._is_zendesk_url("https://example.zendesk.com.evil.com/a.pcap"))
+
+    def test_reports_progress_at_most_once_per_interval(self):
+        progress = []
+        self.connector.save_progress = progress.append
+        self.connector._session = Session([Response(200)] * 3)
+
+        with mock.patch.object(zendesk_connector.time, "monotonic", side_effect=[100.0, 100.5, 101.5]):
+            for _attempt in range(3):
+                self.connector._make_rest_call("/tickets.json", ActionResult())
+
+        self.assertEqual(progress, ["Using api token for authentication", "Made 2 request(s) to Zendesk"])
+
+    def test_truncates_large_error_bodies(self):
+        self.connector._session = Session([Response(422, body={"error": "RecordInvalid", "details": {"base": ["x" * 100] * 100}})])
+
+        action_result = ActionResult()
+        status, _response = self.connector._make_rest_call("/tickets/1.json", action_result, method="put")
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertTrue(action_result.message.startswith('API failed, Status code: 422, Detail: "error": "RecordInvalid"'))
+        self.assertTrue(action_result.message.endswith("..."))
+        self.assertLess(len(action_result.message), 600)
+
+
+class RequestBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector.debug_print = lambda *_args, **_kwargs: None
+        self.connector._requests_per_minute = 60
+        self.connector._deadline = None
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.connector._rate_limit_file = f"{state_dir.name}/1_rate_limit.json"
+        self.sleeps = []
+
+        patcher = mock.patch.object(zendesk_connector.time, "sleep", self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_waits_once_the_shared_bucket_is_empty(self):
+        with mock.patch.object(zendesk_connector.time, "time", return_value=1000.0):
+            for _ in range(12):
+                self.connector._wait_for_request_token()
+
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+
+        # Another action reading the same bucket later sees the refilled tokens
+        other = object.__new__(zendesk_connector.ZendeskConnector)
+        other._requests_per_minute = 60
+        other._deadline = None
+        other._rate_limit_file = self.connector._rate_limit_file
+
+        with mock.patch.object(zendesk_connector.time, "time", return_value=1005.0):
+            other._wait_for_request_token()
+
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+
+    def test_does_not_wait_for_a_token_past_the_deadline(self):
+        self.connector._deadline = 1001.5
+
+        with mock.patch.object(zendesk_connector.time, "time", return_value=1000.0):
+            results = [self.connector._wait_for_request_token() for _ in range(12)]
+
+        # The 11th token is free in 1 second, the 12th one only in 2, after the deadline
+        self.assertEqual(results, [True] * 11 + [False])
+        self.assertEqual(self.sleeps, [1.0])
+
+        # The token that was not taken is still free for the other actions
+        self.connector._deadline = None
+
+        with mock.patch.object(zendesk_connector.time, "time", return_value=1000.0):
+            self.connector._wait_for_request_token()
+
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+
+    def test_fails_the_request_instead_of_waiting_past_the_deadline(self):
+        self.connector._reset_metrics()
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._rate_limit_reset_at = 0
+        self.connector._progress_reported_at = None
+        self.connector._deadline_reached = False
+        self.connector._auth_method = "api token"
+        self.connector.save_progress = lambda *_args, **_kwargs: None
+        self.connector._session = Session([])
+        self.connector._requests_per_minute = 1
+        self.connector._deadline = zendesk_connector.time.time() + 30
+
+        # The first request takes the only token of the bucket, the next one is only free in a minute
+        self.connector._wait_for_request_token()
+
+        action_result = ActionResult()
+        status, _response = self.connector._make_rest_call("/tickets.json", action_result)
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertEqual(action_result.message, "The action deadline was reached before the request could be made")
+        self.assertEqual(self.connector._session.calls, 0)
+        self.assertEqual(self.sleeps, [])
+        self.assertTrue(self.connector._deadline_reached)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._auth_method = "api token"
+        self.connector._retries_left = 3
+        self.connector._rate_limit_reset_at = 0
+        self.connector._requests_per_minute = 0
+        self.connector._timeout = (10, 60)
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._progress_reported_at = None
+        self.connector.save_progress = lambda *_args, **_kwargs: None
+        self.connector.debug_print = lambda *_args, **_kwargs: None
+
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.connector._response_cache_size = 1
+        self.connector._response_cache_file = f"{state_dir.name}/asset_response_cache.json"
+        self.connector._response_cache = None
+        self.connector._response_cache_changed = False
+
+    def test_serves_not_modified_responses_from_the_cache(self):
+        ticket = {"ticket": {"id": 1, "subject": "Printer on fire"}}
+        self.connector._session = Session([Response(200, {"ETag": 'W/"abc"'}, ticket), Response(304, body={})])
+
+        _status, response = self.connector._make_rest_call("/tickets/1.json", ActionResult(), params={"include": "users"}, cache=True)
+        response["ticket"]["requester_id_name"] = "Added by the caller"
+
+        status, response = self.connector._make_rest_call("/tickets/1.json", ActionResult(), params={"include": "users"}, cache=True)
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(response, {"ticket": {"id": 1, "subject": "Printer on fire"}})
+        self.assertNotIn("If-None-Match", self.connector._session.sent_headers[0])
+        self.assertEqual(self.connector._session.sent_headers[1]["If-None-Match"], 'W/"abc"')
+        self.assertEqual(self.connector._metrics["response_cache_hits"], 1)
+        self.assertEqual(self.connector._metrics["response_cache_misses"], 1)
+
+    def test_only_caches_get_requests_asking_for_it(self):
+        self.connector._session = Session([Response(200, {"ETag": 'W/"abc"'})] * 3)
+
+        self.connector._make_rest_call("/tickets/1.json", ActionResult(), method="put", cache=True)
+        self.connector._make_rest_call("/tickets/1.json", ActionResult())
+        self.connector._make_rest_call("/tickets/1.json", ActionResult())
+
+        self.assertEqual(self.connector._session.sent_headers[2], {})
+        self.assertFalse(self.connector._response_cache_changed)
+
+    def test_keeps_the_most_recently_used_responses_within_the_size(self):
+        body = {"ticket": {"description": "x" * 400}}
+        self.connector._session = Session([Response(200, {"ETag": f'"{ticket_id}"'}, body) for ticket_id in range(3)] + [Response(304)])
+
+        for ticket_id in (1, 2, 3, 1):
+            self.connector._make_rest_call(f"/tickets/{ticket_id}.json", ActionResult(), cache=True)
+
+        self.connector._save_response_cache()
+        self.connector._response_cache = None
+        self.connector._load_response_cache()
+
+        self.assertEqual(list(self.connector._response_cache), ["/tickets/3.json", "/tickets/1.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
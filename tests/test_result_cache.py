@@ -0,0 +1,119 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._result_cache_ttl = 30
+        self.connector._result_cache_file = os.path.join(state_dir.name, "asset_result_cache.json")
+        self.connector._result_cache_cleared_file = os.path.join(state_dir.name, "asset_result_cache_cleared")
+        self.connector._deadline_reached = False
+        self.connector.debug_print = lambda *_args: None
+        self.connector.get_config = lambda: {}
+        self.connector.get_action_identifier = lambda: "run_query"
+        self.action_results = []
+        self.connector.add_action_result = self.add_action_result
+        self.connector.get_action_results = lambda: self.action_results
+        self.calls = []
+
+    def add_action_result(self, action_result):
+        self.action_results.append(action_result)
+        return action_result
+
+    def run_query(self, param):
+        self.calls.append(param)
+        action_result = self.add_action_result(ActionResult(dict(param)))
+        action_result.add_data({"id": len(self.calls)})
+        action_result.set_summary({"total_tickets": 1})
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def test_returns_the_cached_results_of_the_same_query(self):
+        self.connector._run_cached(self.run_query, {"query": "status:open  priority:high", "context": {"guid": "a"}})
+        status = self.connector._run_cached(self.run_query, {"query": " status:open priority:high", "context": {"guid": "b"}})
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.action_results[1].data, [{"id": 1}])
+        self.assertEqual(self.action_results[1].summary, {"total_tickets": 1})
+
+        self.connector._run_cached(self.run_query, {"query": "status:open priority:high", "fields_to_return": "subject"})
+        self.connector._run_cached(self.run_query, {"query": "status:open priority:high", "page_number": 2})
+
+        self.assertEqual(len(self.calls), 3)
+
+    def test_bypass_refreshes_the_cached_results(self):
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+        self.connector._run_cached(self.run_query, {"query": "status:open", "bypass_cache": True})
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.action_results[2].data, [{"id": 2}])
+
+    def test_expired_and_partial_results_are_not_returned(self):
+        self.connector._deadline_reached = True
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+        self.connector._deadline_reached = False
+
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        with mock.patch.object(zendesk_connector.time, "time", return_value=zendesk_connector.time.time() + 31):
+            self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        self.assertEqual(len(self.calls), 3)
+
+    def test_write_actions_clear_the_cached_results(self):
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+        self.connector._run_invalidating(lambda _param: phantom.APP_ERROR, {"subject": "Printer on fire"})
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_results_retrieved_before_a_write_are_not_returned(self):
+        def run_query_during_write(param):
+            status = self.run_query(param)
+            self.connector._clear_result_cache()
+            return status
+
+        self.connector._run_cached(run_query_during_write, {"query": "status:open"})
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_evicts_the_oldest_results(self):
+        with mock.patch.object(zendesk_connector.consts, "ZENDESK_RESULT_CACHE_MAX_SIZE", 0.1):
+            self.connector._run_cached(self.run_query, {"query": "status:open"})
+            self.connector._run_cached(self.run_query, {"query": "status:new"})
+
+        self.connector._run_cached(self.run_query, {"query": "status:new"})
+        self.connector._run_cached(self.run_query, {"query": "status:open"})
+
+        self.assertEqual([param["query"] for param in self.calls], ["status:open", "status:new", "status:open"])
+
+
+if __name__ == "__main__":
+    unittest.main()
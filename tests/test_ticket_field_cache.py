@@ -0,0 +1,70 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import unittest
+
+import phantom.app as phantom
+from phantom.action_result import ActionResult
+
+import zendesk_connector
+
+
+class TicketFieldCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._base_url = "https://example.zendesk.com"
+        self.connector._api_uri = "/api/v2"
+        self.connector._ticket_fields_cache_ttl = 3600
+        self.connector._ticket_field_index = None
+        self.connector._state = {"ticket_fields": {"cached_at": zendesk_connector.time.time(), "index": {"Cached": 1}}}
+        self.catalog = [{"id": 2, "raw_title": "Fetched"}, {"id": 3, "raw_title": "Fetched"}]
+        self.calls = []
+        self.connector._make_rest_call = self._make_rest_call
+
+    def _make_rest_call(self, endpoint, action_result=None, params=None, **_kwargs):
+        self.calls.append(endpoint)
+        return 0, {"ticket_fields": self.catalog, "next_page": None}
+
+    def test_uses_cached_index_without_requesting(self):
+        status, custom_fields = self.connector._handle_custom_fields(ActionResult(), [{"Cached": "value"}])
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(custom_fields, [{"id": 1, "value": "value"}])
+        self.assertEqual(self.calls, [])
+
+    def test_rebuilds_cached_index_when_title_is_missing(self):
+        status, custom_fields = self.connector._handle_custom_fields(ActionResult(), [{"Fetched": "value"}])
+
+        self.assertEqual(status, phantom.APP_SUCCESS)
+        self.assertEqual(custom_fields, [{"id": 2, "value": "value"}])
+        self.assertEqual(self.calls, ["/ticket_fields.json"])
+        self.assertEqual(self.connector._state["ticket_fields"]["index"], {"Fetched": 2})
+
+    def test_reports_titles_missing_from_rebuilt_index(self):
+        action_result = ActionResult()
+
+        status, custom_fields = self.connector._handle_custom_fields(action_result, [{"Cached": "value"}, {"Unknown": "value"}])
+
+        self.assertEqual(status, phantom.APP_ERROR)
+        self.assertIsNone(custom_fields)
+        self.assertEqual(action_result.message, "Unable to resolve ticket custom field title(s): Cached, Unknown")
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,11 @@ sys.modules["phantom.action_result"] = action_result_module
 base_connector_module = types.ModuleType("phantom.base_connector")
 base_connector_module.BaseConnector = object
 sys.modules["phantom.base_connector"] = base_connector_module
+sys.modules["phantom.rules"] = types.ModuleType("phantom.rules")
+
+vault_module = types.ModuleType("phantom.vault")
+vault_module.Vault = object
+sys.modules["phantom.vault"] = vault_module
 
 sys.modules["requests"] = types.ModuleType("requests")
 sys.modules["simplejson"] = json
@@ -88,6 +93,24 @@ class TicketIdValidationTest(unittest.TestCase):
                 self.assertEqual(status, phantom.APP_ERROR)
                 self.assertIsNone(endpoint)
 
+    def test_accepts_comma_separated_and_json_lists_of_ticket_ids(self):
+        for ticket_ids in ("12, 7,12", "[12, 7, 12]", '["12", "7"]'):
+            with self.subTest(ticket_ids=ticket_ids):
+                status, parsed = self.connector._get_ticket_ids({"id": ticket_ids}, ActionResult())
+
+                self.assertEqual(status, phantom.APP_SUCCESS)
+                self.assertEqual(parsed, ["12", "7"])
+
+    def test_rejects_lists_holding_an_invalid_ticket_id(self):
+        for ticket_ids in ("12,../users.json?", "[12, -1]", "[12,", "[]", "12,"):
+            with self.subTest(ticket_ids=ticket_ids):
+                action_result = ActionResult()
+                status, parsed = self.connector._get_ticket_ids({"id": ticket_ids}, action_result)
+
+                self.assertEqual(status, phantom.APP_ERROR)
+                self.assertIsNone(parsed)
+                self.assertEqual(action_result.message, "Please provide a positive numeric ticket ID")
+
     def test_handlers_reject_injected_ticket_ids_before_requesting(self):
         for handler_name in ("_get_ticket", "_update_ticket"):
             with self.subTest(handler_name=handler_name):
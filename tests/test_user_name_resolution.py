@@ -0,0 +1,190 @@
+# Copyright (c) 2026 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=no-member
+import copy
+import json
+import os
+import tempfile
+import unittest
+
+import zendesk_connector
+
+
+class UserNameResolutionTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._reset_metrics()
+        self.connector._max_concurrent_requests = 1
+        self.connector._executor = None
+        self.connector._lock = zendesk_connector.threading.Lock()
+        self.connector._ZendeskConnector__id_to_name = {}
+        self.connector._group_names = {}
+        self.connector._organization_names = {}
+        self.connector._deadline = None
+        self.connector._deadline_reached = False
+        self.connector._progress_reported_at = None
+        self.connector.debug_print = lambda *_args, **_kwargs: None
+        self.calls = []
+
+    def _make_rest_call(self, endpoint, _action_result, params=None, **_kwargs):
+        self.calls.append((endpoint, params))
+        user_ids = [int(user_id) for user_id in params["ids"].split(",")]
+        return 0, {"users": [{"id": user_id, "name": f"user {user_id}"} for user_id in user_ids]}
+
+    def test_resolves_page_of_tickets_with_one_request(self):
+        self.connector._make_rest_call = self._make_rest_call
+        tickets = [
+            {"submitter_id": 1, "assignee_id": 2, "requester_id": 3},
+            {"submitter_id": 1, "assignee_id": None, "requester_id": 4},
+        ]
+
+        self.connector._add_names_to_ids(tickets)
+
+        self.assertEqual(self.calls, [("/users/show_many.json", {"ids": "1,2,3,4"})])
+        self.assertEqual(tickets[0]["assignee_id_name"], "user 2")
+        self.assertEqual(tickets[1]["requester_id_name"], "user 4")
+        self.assertNotIn("assignee_id_name", tickets[1])
+
+    def test_chunks_unseen_ids_and_skips_known_ones(self):
+        self.connector._make_rest_call = self._make_rest_call
+        self.connector._ZendeskConnector__id_to_name = {1: ("known", 0)}
+
+        self.connector._resolve_user_names(range(1, 152))
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.calls[0][1]["ids"].split(",")[0], "2")
+        self.assertEqual(len(self.calls[0][1]["ids"].split(",")), 100)
+        self.assertEqual(len(self.calls[1][1]["ids"].split(",")), 50)
+        self.assertEqual(self.connector._ZendeskConnector__id_to_name[1], ("known", 0))
+        self.assertEqual(self.connector._metrics["user_cache_hits"], 1)
+        self.assertEqual(self.connector._metrics["user_cache_misses"], 150)
+
+    def test_fetches_chunks_concurrently(self):
+        self.connector._make_rest_call = self._make_rest_call
+        self.connector._max_concurrent_requests = 4
+        self.addCleanup(lambda: self.connector._executor.shutdown())
+
+        self.connector._resolve_user_names(range(1, 351))
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(self.connector._get_cached_user_name(350), "user 350")
+        self.assertEqual(len(self.connector._ZendeskConnector__id_to_name), 350)
+
+    def test_uses_sideloaded_records_without_requests(self):
+        self.connector._make_rest_call = self._make_rest_call
+        tickets = [{"submitter_id": 1, "assignee_id": 2, "requester_id": 1, "group_id": 3, "organization_id": 4}]
+
+        self.connector._add_sideloads(
+            {
+                "tickets": tickets,
+                "users": [{"id": 1, "name": "user 1"}, {"id": 2, "name": "user 2"}],
+                "groups": [{"id": 3, "name": "group 3"}],
+                "organizations": [{"id": 4, "name": "organization 4"}],
+            }
+        )
+        self.connector._add_names_to_ids(tickets)
+
+        self.assertEqual(self.calls, [])
+        self.assertEqual(tickets[0]["assignee_id_name"], "user 2")
+        self.assertEqual(tickets[0]["group_id_name"], "group 3")
+        self.assertEqual(tickets[0]["organization_id_name"], "organization 4")
+
+    def test_caches_unresolvable_users(self):
+        self.connector._make_rest_call = lambda *_args, **_kwargs: (0, {"users": [{"id": 1, "name": "user 1"}]})
+
+        self.connector._resolve_user_names([1, 2])
+
+        self.assertEqual(self.connector._get_cached_user_name(1), "user 1")
+        self.assertIn(2, self.connector._ZendeskConnector__id_to_name)
+        self.assertIsNone(self.connector._get_cached_user_name(2))
+
+
+class UserNameCacheStateTest(unittest.TestCase):
+    def setUp(self):
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._user_cache_ttl = 3600
+        self.connector._user_cache_max_entries = 2
+
+    def test_drops_expired_and_invalid_entries_on_load(self):
+        now = zendesk_connector.time.time()
+        self.connector._state = {"user_names": {"1": ["fresh", now], "2": ["stale", now - 7200]}}
+
+        self.connector._load_user_cache()
+
+        self.assertEqual(self.connector._ZendeskConnector__id_to_name, {1: ("fresh", now)})
+
+        self.connector._state = {"user_names": {"1": "garbage"}}
+
+        self.connector._load_user_cache()
+
+        self.assertEqual(self.connector._ZendeskConnector__id_to_name, {})
+
+    def test_evicts_least_recently_used_entries_on_save(self):
+        self.connector._state = {}
+        self.connector._ZendeskConnector__id_to_name = {1: ("one", 1), 2: ("two", 2), 3: ("three", 3)}
+
+        self.connector._get_cached_user_name(1)
+        self.connector._save_user_cache()
+
+        self.assertEqual(self.connector._state["user_names"], {"3": ["three", 3], "1": ["one", 1]})
+
+
+class StateSaveTest(unittest.TestCase):
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+
+        self.connector = object.__new__(zendesk_connector.ZendeskConnector)
+        self.connector._state_lock_file = os.path.join(state_dir.name, "asset_state.lock")
+        self.connector.debug_print = lambda *_args: None
+        self.connector.load_state = lambda: dict(self.saved_state)
+        self.connector.save_state = self.save_state
+        self.saves = 0
+
+    def save_state(self, state):
+        self.saved_state = state
+        self.saves += 1
+
+    def test_keeps_the_keys_saved_meanwhile_by_other_actions(self):
+        self.connector._state = {"poll_cursor": "old", "user_names": {}, "ticket_fields": {"index": {}}}
+        self.connector._loaded_state = copy.deepcopy(self.connector._state)
+
+        # A poll running at the same time moved the cursor
+        self.saved_state = {"poll_cursor": "new", "user_names": {}, "ticket_fields": {"index": {}}}
+
+        self.connector._state["user_names"]["1"] = ["one", 1]
+        self.connector._state.pop("ticket_fields")
+        self.connector._save_state_changes()
+
+        self.assertEqual(self.saved_state, {"poll_cursor": "new", "user_names": {"1": ["one", 1]}})
+
+    def test_does_not_save_an_unchanged_state(self):
+        now = zendesk_connector.time.time()
+        self.connector._user_cache_ttl = 3600
+        self.connector._user_cache_max_entries = 10
+
+        # The state is loaded from JSON, the user names are lists there
+        self.connector._state = json.loads(json.dumps({"poll_cursor": "old", "user_names": {"1": ["one", now], "2": [None, now]}}))
+        self.connector._loaded_state = copy.deepcopy(self.connector._state)
+
+        self.connector._load_user_cache()
+        self.connector._get_cached_user_name(1)
+        self.connector._save_user_cache()
+        self.connector._save_state_changes()
+
+        self.assertEqual(self.saves, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,26 +15,155 @@
 """Code that implements calls made to the zendesk systems device"""
 
 # Python imports
-from urllib.parse import parse_qsl, urlparse
+import codecs
+import copy
+import fcntl
+import math
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import takewhile
+from urllib.parse import parse_qsl, urlencode, urlparse
 
 # Phantom imports
 import phantom.app as phantom
+import phantom.rules as ph_rules
 import requests
 import simplejson as json
 from phantom.action_result import ActionResult
 from phantom.base_connector import BaseConnector
+from phantom.vault import Vault
 
 # THIS Connector imports
 import zendesk_consts as consts
 
 
+class _JsonStream:
+    """Decodes a JSON object from the chunks of a response body as they are read, only the part of the body that is
+    not decoded yet is held in memory. The arrays at the top level of the object, e.g. the tickets or the results of a
+    page, are decoded item by item."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._keys = {}
+        # The keys repeated in every item are shared between the items, as json.loads does within a whole body
+        self._decoder = json.JSONDecoder(object_pairs_hook=lambda pairs: {self._keys.setdefault(key, key): value for key, value in pairs})
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _read(self):
+        """Appends the next chunk to the buffer, returns False once the whole body has been read"""
+
+        if self._eof:
+            return False
+
+        # The decoded part of the buffer is dropped before it grows
+        self._buffer = self._buffer[self._position :]
+        self._position = 0
+
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += self._text_decoder.decode(chunk)
+                return True
+
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+
+        return True
+
+    def _next_char(self, expected=""):
+        """Skips the whitespace and returns the next character, it is consumed if it is one of the expected ones"""
+
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in " \t\r\n":
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                char = self._buffer[self._position]
+                if char in expected:
+                    self._position += 1
+                return char
+
+            if not self._read():
+                raise ValueError("Unexpected end of the JSON body")
+
+    def _value(self):
+        """Decodes the next value, more of the body is read until the value is complete"""
+
+        self._next_char()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if not self._read():
+                    raise
+                continue
+
+            # A number is only complete once a delimiter follows it, e.g. 3.5 may be the start of 3.5e-07
+            if type(value) in (int, float) and (end == len(self._buffer) or self._buffer[end] not in ",]}: \t\r\n") and self._read():
+                continue
+
+            self._position = end
+            return value
+
+    def decode(self):
+        """Returns the decoded JSON object"""
+
+        result = {}
+
+        if self._next_char("{") != "{":
+            raise ValueError("The JSON body is not an object")
+
+        if self._next_char("}") == "}":
+            return result
+
+        while True:
+            key = self._value()
+
+            if self._next_char(":") != ":":
+                raise ValueError("Expecting ':' in the JSON body")
+
+            if self._next_char("[") == "[":
+                items = result[key] = []
+                if self._next_char("]") != "]":
+                    while True:
+                        items.append(self._value())
+                        char = self._next_char(",]")
+                        if char == "]":
+                            break
+                        if char != ",":
+                            raise ValueError("Expecting ',' or ']' in the JSON body")
+            else:
+                result[key] = self._value()
+
+            char = self._next_char(",}")
+            if char == "}":
+                return result
+            if char != ",":
+                raise ValueError("Expecting ',' or '}' in the JSON body")
+
+
 class ZendeskConnector(BaseConnector):
     # actions supported by this script
     ACTION_ID_LIST_TICKETS = "list_tickets"
     ACTION_ID_CREATE_TICKET = "create_ticket"
+    ACTION_ID_CREATE_TICKETS = "create_tickets"
     ACTION_ID_GET_TICKET = "get_ticket"
     ACTION_ID_UPDATE_TICKET = "update_ticket"
     ACTION_ID_RUN_QUERY = "run_query"
+    ACTION_ID_EXPORT_TICKETS = "export_tickets"
+    ACTION_ID_GET_TICKET_COMMENTS = "get_ticket_comments"
+    ACTION_ID_UPLOAD_ATTACHMENT = "upload_attachment"
+    ACTION_ID_DOWNLOAD_ATTACHMENT = "download_attachment"
 
     def __init__(self):
         self.__id_to_name = {}
@@ -45,6 +174,39 @@ class ZendeskConnector(BaseConnector):
         self._key = None
         self._username = None
         self._auth_method = None
+        self._session = None
+        self._state = None
+        self._loaded_state = None
+        self._state_lock_file = None
+        self._user_cache_ttl = None
+        self._user_cache_max_entries = None
+        self._ticket_fields_cache_ttl = None
+        self._ticket_field_index = None
+        self._group_names = {}
+        self._organization_names = {}
+        self._retries_left = None
+        self._rate_limit_reset_at = 0
+        self._requests_per_minute = None
+        self._rate_limit_file = None
+        self._response_cache_size = None
+        self._response_cache_file = None
+        self._response_cache = None
+        self._response_cache_changed = False
+        self._mirror_max_age = None
+        self._mirror_file = None
+        self._mirror = None
+        self._result_cache_ttl = None
+        self._result_cache_file = None
+        self._result_cache_cleared_file = None
+        self._timeout = None
+        self._deadline = None
+        self._deadline_reached = False
+        self._metrics = None
+        self._reset_metrics()
+        self._max_concurrent_requests = 1
+        self._executor = None
+        self._lock = threading.Lock()
+        self._progress_reported_at = None
 
         # Call the BaseConnectors init first
         super().__init__()
@@ -84,379 +246,1891 @@ class ZendeskConnector(BaseConnector):
             self._username += "/token"
             self._auth_method = "api token"
 
-        return phantom.APP_SUCCESS
+        # Independent requests of the action, e.g. the user lookups of different chunks or the next page of results,
+        # are made concurrently by a pool of threads sharing the session, up to this limit
+        ret_val, self._max_concurrent_requests = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_MAX_CONCURRENT_REQUESTS, consts.ZENDESK_DEFAULT_MAX_CONCURRENT_REQUESTS),
+            consts.ZENDESK_JSON_MAX_CONCURRENT_REQUESTS,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        if self._max_concurrent_requests > consts.ZENDESK_SESSION_POOL_SIZE:
+            return self.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_MAX_CONCURRENT_REQUESTS.format(max=consts.ZENDESK_SESSION_POOL_SIZE))
+
+        # A single session is used for all the REST calls of the action, so that connections are kept alive and
+        # reused instead of doing a new TLS handshake for every call
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=consts.ZENDESK_SESSION_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.auth = (self._username, self._key)
+        self._session.headers.update(self._headers)
+        self._session.verify = True
+
+        # The asset state is used to persist data like resolved user names across actions
+        self._state = self.load_state()
+        if not isinstance(self._state, dict):
+            self._state = {}
+
+        # Only the keys changed by the action are saved, the snapshot tells which ones
+        self._loaded_state = copy.deepcopy(self._state)
+        self._state_lock_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_state.lock")
+
+        ret_val, self._user_cache_ttl = self._validate_integer(
+            self, config.get(consts.ZENDESK_JSON_USER_CACHE_TTL, consts.ZENDESK_DEFAULT_USER_CACHE_TTL), consts.ZENDESK_JSON_USER_CACHE_TTL, True
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-    def _make_rest_call(self, endpoint, action_result, headers=None, params=None, data=None, method="get"):
-        """Function that makes the REST call to the device, generic function that can be called from various action
-        handlers"""
+        ret_val, self._user_cache_max_entries = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_USER_CACHE_MAX_ENTRIES, consts.ZENDESK_DEFAULT_USER_CACHE_MAX_ENTRIES),
+            consts.ZENDESK_JSON_USER_CACHE_MAX_ENTRIES,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        if headers is None:
-            headers = {}
+        ret_val, self._ticket_fields_cache_ttl = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_TICKET_FIELDS_CACHE_TTL, consts.ZENDESK_DEFAULT_TICKET_FIELDS_CACHE_TTL),
+            consts.ZENDESK_JSON_TICKET_FIELDS_CACHE_TTL,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        # Create the headers
-        headers.update(self._headers)
+        # The retry budget is shared by all the REST calls made by the action
+        ret_val, self._retries_left = self._validate_integer(
+            self, config.get(consts.ZENDESK_JSON_RETRY_BUDGET, consts.ZENDESK_DEFAULT_RETRY_BUDGET), consts.ZENDESK_JSON_RETRY_BUDGET, True
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        # The request budget is shared by all the actions running against the asset through a file in the state directory
+        ret_val, self._requests_per_minute = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_REQUESTS_PER_MINUTE, consts.ZENDESK_DEFAULT_REQUESTS_PER_MINUTE),
+            consts.ZENDESK_JSON_REQUESTS_PER_MINUTE,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
+
+        if self._requests_per_minute:
+            self._rate_limit_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_rate_limit.json")
+
+        # The cached responses are kept in a file of the state directory rather than in the asset state, so that they
+        # are only read by the actions making a cacheable request
+        ret_val, self._response_cache_size = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_RESPONSE_CACHE_SIZE, consts.ZENDESK_DEFAULT_RESPONSE_CACHE_SIZE),
+            consts.ZENDESK_JSON_RESPONSE_CACHE_SIZE,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        if method in consts.ZENDESK_REQUEST_METHODS:
-            headers.update({"Content-Type": "application/json"})
+        if self._response_cache_size:
+            self._response_cache_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_response_cache.json")
 
-        resp_json = None
+        # The local mirror of the tickets is only created by the first run query action asking for it
+        ret_val, self._mirror_max_age = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_LOCAL_MIRROR_MAX_AGE, consts.ZENDESK_DEFAULT_LOCAL_MIRROR_MAX_AGE),
+            consts.ZENDESK_JSON_LOCAL_MIRROR_MAX_AGE,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        # get or post or put, whatever the caller asked us to use, if not specified the default will be 'get'
-        request_func = getattr(requests, method)
+        self._mirror_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_tickets.db")
 
-        # handle the error in case the caller specified a non-existent method
-        if not request_func:
-            action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_API_UNSUPPORTED_METHOD, method=method)
+        ret_val, self._result_cache_ttl = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_RESULT_CACHE_TTL, consts.ZENDESK_DEFAULT_RESULT_CACHE_TTL),
+            consts.ZENDESK_JSON_RESULT_CACHE_TTL,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        self.save_progress(f"Using {self._auth_method} for authentication")
+        # The write actions invalidate the cached results even while the cache is disabled, so that the results cached
+        # before it was disabled are never returned once it is enabled again
+        self._result_cache_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_result_cache.json")
+        self._result_cache_cleared_file = os.path.join(self.get_state_dir(), f"{self.get_asset_id()}_result_cache_cleared")
 
-        # Make the call
-        try:
-            r = request_func(
-                self._base_url + self._api_uri + endpoint,  # The complete url is made up of the base_url, the api url and the endpiont
-                auth=(self._username, self._key),  # The authentication method, currently set to simple base authentication
-                data=json.dumps(data) if data else None,  # the data, converted to json string format if present, else just set to None
-                headers=headers,  # The headers to send in the HTTP call
-                verify=True,  # cert verification should be true
-                params=params,
-            )  # uri parameters if any
-        except Exception as e:
-            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_SERVER_CONNECTION, e), resp_json
+        ret_val, connect_timeout = self._validate_integer(
+            self, config.get(consts.ZENDESK_JSON_CONNECT_TIMEOUT, consts.ZENDESK_DEFAULT_CONNECT_TIMEOUT), consts.ZENDESK_JSON_CONNECT_TIMEOUT
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        # self.debug_print('REST url: {0}'.format(r.url))
+        ret_val, read_timeout = self._validate_integer(
+            self, config.get(consts.ZENDESK_JSON_READ_TIMEOUT, consts.ZENDESK_DEFAULT_READ_TIMEOUT), consts.ZENDESK_JSON_READ_TIMEOUT
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        # Try a json parse, since most REST API's give back the data in json.
-        # If the device does not return JSONs, then need to implement parsing them some other manner.
-        try:
-            resp_json = r.json()
-        except Exception as e:
-            # r.text is guaranteed to be NON None, it will be empty, but not None
-            try:
-                msg_string = consts.ZENDESK_ERR_JSON_PARSE.format(raw_text=r.text.encode("utf-8"))
-            except:
-                msg_string = "Unable to parse response as a Json"
-            if len(msg_string) > 500:
-                msg_string = "Error while parsing the response"
-            return action_result.set_status(phantom.APP_ERROR, msg_string, e), resp_json
+        self._timeout = (connect_timeout, read_timeout)
 
-        if r.status_code in consts.ZENDESK_EMPTY_RESPONSE_STATUS_CODES:
-            return phantom.APP_SUCCESS, resp_json
+        # The deadline bounds the whole action, however many requests it makes
+        ret_val, action_deadline = self._validate_integer(
+            self,
+            config.get(consts.ZENDESK_JSON_ACTION_DEADLINE, consts.ZENDESK_DEFAULT_ACTION_DEADLINE),
+            consts.ZENDESK_JSON_ACTION_DEADLINE,
+            True,
+        )
+        if phantom.is_fail(ret_val):
+            return self.get_status()
 
-        # Handle/process any errors that we get back from the device
-        if 200 <= r.status_code <= 399:
-            # Success
-            return phantom.APP_SUCCESS, resp_json
+        if action_deadline:
+            self._deadline = time.time() + action_deadline
 
-        # Failure
-        action_result.add_data(resp_json)
+        self._load_user_cache()
 
-        details = json.dumps(resp_json).replace("{", "").replace("}", "")
+        return phantom.APP_SUCCESS
 
-        return action_result.set_status(
-            phantom.APP_ERROR, consts.ZENDESK_ERR_FROM_SERVER.format(status=r.status_code, detail=details)
-        ), resp_json
+    def finalize(self):
+        """Called once for every action after the action handler, saves the asset state"""
 
-    def _test_connectivity(self, param):
-        """Function that handles the test connectivity action, it is much simpler than other action handlers."""
+        if self._state is not None:
+            self._save_user_cache()
+            self._save_state_changes()
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
+        # The prefetched pages that were not needed are dropped
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
 
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
+        self._save_response_cache()
 
-        # set the endpoint
-        endpoint = "/tickets/recent.json"
+        if self._mirror is not None:
+            self._mirror.close()
+            self._mirror = None
 
-        params = {"per_page": 1}
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
-        # Action result to represent the call
-        action_result = ActionResult()
+        return phantom.APP_SUCCESS
 
-        # Progress message, since it is test connectivity, it pays to be verbose
-        self.save_progress(consts.ZENDESK_MSG_GET_INCIDENT_TEST)
+    def _save_state_changes(self):
+        """Saves the keys of the asset state changed by the action. The state is loaded again first, so that the keys
+        changed meanwhile by the concurrent actions, like the export and poll cursors, are not overwritten with the
+        values loaded when this action started."""
 
-        # Make the rest endpoint call
-        ret_val, _response = self._make_rest_call(endpoint, action_result, params=params)
+        changed_keys = [key for key in self._state.keys() | self._loaded_state.keys() if self._state.get(key) != self._loaded_state.get(key)]
+        if not changed_keys:
+            return
 
-        # Process errors
-        if phantom.is_fail(ret_val):
-            # Dump error messages in the log
-            self.debug_print(action_result.get_message())
+        # The lock serializes the state updates of the concurrent actions
+        lock_file = None
+        try:
+            lock_file = os.fdopen(os.open(self._state_lock_file, os.O_RDWR | os.O_CREAT, 0o600))
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except OSError as e:
+            # The lock only narrows the window between loading and saving the state, save it anyway
+            self.debug_print(f"Unable to lock the asset state: {e}")
 
-            # Set the status of the complete connector result
-            self.set_status(phantom.APP_ERROR, action_result.get_message())
+        try:
+            state = self.load_state()
+            if not isinstance(state, dict):
+                state = {}
 
-            # Append the message to display
-            self.append_to_message(consts.ZENDESK_ERR_CONNECTIVITY_TEST)
+            for key in changed_keys:
+                if key in self._state:
+                    state[key] = self._state[key]
+                else:
+                    state.pop(key, None)
 
-            # return error
-            return phantom.APP_ERROR
+            self.save_state(state)
+        finally:
+            if lock_file is not None:
+                lock_file.close()
 
-        # Set the status of the connector result
-        return self.set_status_save_progress(phantom.APP_SUCCESS, consts.ZENDESK_SUCC_CONNECTIVITY_TEST)
+        self._loaded_state = copy.deepcopy(self._state)
 
-    def _get_fields(self, param, action_result):
-        """Validates the field parameter that is a json, created a function to make the caller code cleaner"""
+        return
 
-        fields = param.get(consts.ZENDESK_JSON_FIELDS)
+    def _validate_integer(self, action_result, parameter, key, allow_zero=False):
+        """Validates that the given parameter is a non-negative integer, zero is only accepted if allow_zero is set"""
 
-        # fields is an optional field
-        if not fields:
+        if parameter is None:
             return phantom.APP_SUCCESS, None
 
-        # we take in as a dictionary string, first try to load it as is
         try:
-            fields = json.loads(fields)
-        except Exception as e:
-            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_FIELDS_JSON_PARSE, e), None
+            if not float(parameter).is_integer():
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_INTEGER.format(key=key)), None
+            parameter = int(parameter)
+        except (TypeError, ValueError):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_INTEGER.format(key=key)), None
+
+        if parameter < 0 or (parameter == 0 and not allow_zero):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_INTEGER.format(key=key)), None
+
+        return phantom.APP_SUCCESS, parameter
+
+    def _reset_metrics(self):
+        """Resets the metrics of the requests made by the action, they are added to the summary of its results"""
+
+        self._metrics = {
+            consts.ZENDESK_METRIC_REQUESTS: 0,
+            consts.ZENDESK_METRIC_REQUEST_TIME: 0.0,
+            consts.ZENDESK_METRIC_RETRIES: 0,
+            consts.ZENDESK_METRIC_BYTES_RECEIVED: 0,
+            consts.ZENDESK_METRIC_RATE_LIMIT_REMAINING: None,
+            consts.ZENDESK_METRIC_USER_CACHE_HITS: 0,
+            consts.ZENDESK_METRIC_USER_CACHE_MISSES: 0,
+            consts.ZENDESK_METRIC_TICKET_FIELDS_CACHE_HITS: 0,
+            consts.ZENDESK_METRIC_TICKET_FIELDS_CACHE_MISSES: 0,
+            consts.ZENDESK_METRIC_RESPONSE_CACHE_HITS: 0,
+            consts.ZENDESK_METRIC_RESPONSE_CACHE_MISSES: 0,
+            consts.ZENDESK_METRIC_ENDPOINTS: {},
+        }
 
-        return phantom.APP_SUCCESS, fields
+        return
 
-    def _get_ticket_endpoint(self, param, action_result):
-        """Validates a ticket ID before using it in a Zendesk API path."""
+    def _record_request(self, endpoint, elapsed, received):
+        """Adds a request to the metrics, the requests are grouped by the first segment of their endpoint, e.g.
+        tickets, users, ticket_fields or search"""
 
-        ticket_id = str(param.get(consts.ZENDESK_JSON_TICKET_ID, ""))
+        category = endpoint.lstrip("/").split("/", 1)[0].split(".", 1)[0]
 
-        if not ticket_id.isascii() or not ticket_id.isdecimal() or int(ticket_id) < 1:
-            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_TICKET_ID), None
+        # The requests made concurrently are recorded from several threads
+        with self._lock:
+            endpoint_metrics = self._metrics[consts.ZENDESK_METRIC_ENDPOINTS].setdefault(
+                category, {consts.ZENDESK_METRIC_REQUESTS: 0, consts.ZENDESK_METRIC_REQUEST_TIME: 0.0}
+            )
+            endpoint_metrics[consts.ZENDESK_METRIC_REQUESTS] += 1
+            endpoint_metrics[consts.ZENDESK_METRIC_REQUEST_TIME] += elapsed
 
-        return phantom.APP_SUCCESS, f"/tickets/{ticket_id}.json"
+            self._metrics[consts.ZENDESK_METRIC_REQUESTS] += 1
+            self._metrics[consts.ZENDESK_METRIC_REQUEST_TIME] += elapsed
 
-    def _add_names_to_ids(self, ticket):
-        """Function parses the ticket and adds names to all the ids present in it"""
+            self._metrics[consts.ZENDESK_METRIC_BYTES_RECEIVED] += received
 
-        user_id_keys = ["submitter_id", "assignee_id", "requester_id"]
+        return
 
-        for user_id_key in user_id_keys:
-            user_id = ticket[user_id_key]
+    def _add_metrics_to_summary(self):
+        """Logs the metrics of the action and adds them to the summary of its results"""
+
+        metrics = dict(self._metrics)
+        metrics[consts.ZENDESK_METRIC_REQUEST_TIME] = round(metrics[consts.ZENDESK_METRIC_REQUEST_TIME], 3)
+        metrics[consts.ZENDESK_METRIC_ENDPOINTS] = {
+            category: {
+                consts.ZENDESK_METRIC_REQUESTS: endpoint_metrics[consts.ZENDESK_METRIC_REQUESTS],
+                consts.ZENDESK_METRIC_REQUEST_TIME: round(endpoint_metrics[consts.ZENDESK_METRIC_REQUEST_TIME], 3),
+            }
+            for category, endpoint_metrics in metrics[consts.ZENDESK_METRIC_ENDPOINTS].items()
+        }
 
-            key_name = f"{user_id_key}_name"
+        self.debug_print("Request metrics of the action", metrics)
 
-            user_name = self.__id_to_name.get(user_id)
+        # The progress of the requests is rate limited, so the final count is always reported
+        if self._progress_reported_at is not None:
+            self.save_progress(consts.ZENDESK_MSG_REQUESTS_MADE.format(count=metrics[consts.ZENDESK_METRIC_REQUESTS]))
 
-            if user_name:
-                ticket[key_name] = user_name
-                continue
+        for action_result in self.get_action_results():
+            action_result.update_summary({consts.ZENDESK_JSON_METRICS: metrics})
 
-            user_details_ar = ActionResult()
+        return
 
-            endpoint = f"/users/{user_id}.json"
+    def _submit(self, func, *args, **kwargs):
+        """Starts func in the background when concurrent requests are enabled, returns a callable that waits for its
+        result. Otherwise func is only called when its result is asked for, like a plain call."""
 
-            # Make the rest call
-            ret_val, response = self._make_rest_call(endpoint, user_details_ar)
-            if phantom.is_fail(ret_val):
-                continue
+        if self._max_concurrent_requests <= 1:
+            return lambda: func(*args, **kwargs)
 
-            user = response.get("user")
-            if not user:
-                continue
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_concurrent_requests, thread_name_prefix="zendesk")
 
-            ticket[key_name] = user.get("name")
-            if ticket[key_name]:
-                self.__id_to_name[user_id] = ticket[key_name]
+        return self._executor.submit(func, *args, **kwargs).result
 
-        return
+    def _run_concurrently(self, func, items):
+        """Calls func on every item, up to max_concurrent_requests at a time, returns the results in the order of items"""
 
-    def _create_ticket(self, param):
-        """Action handler for the 'create ticket' action"""
+        pending = [self._submit(func, item) for item in items]
 
-        # This is an action that needs to be represented by the ActionResult object
-        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
-        # When the action_result is created this way, the parameter is also passed.
-        # Other things like the summary, data and status is set later on.
-        action_result = self.add_action_result(ActionResult(dict(param)))
+        return [result() for result in pending]
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
+    def _get_time_left(self):
+        """Returns the number of seconds left before the action deadline, None if the action has no deadline"""
 
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
+        if self._deadline is None:
+            return None
 
-        # Set the endpoint
-        endpoint = "/tickets.json"
+        return self._deadline - time.time()
 
-        ticket = {"subject": param[consts.ZENDESK_JSON_SUBJECT], "comment": {"body": param[consts.ZENDESK_JSON_DESCRIPTION]}}
+    def _is_past_deadline(self):
+        """Checks whether the action deadline is reached, the loops making several requests call it to stop early and
+        return the results gathered so far"""
 
-        # Parse and set the fields parameter, it is optional
-        ret_val, fields = self._get_fields(param, action_result)
+        time_left = self._get_time_left()
 
-        # Process error
-        if phantom.is_fail(ret_val):
-            return action_result.get_status()
+        if time_left is None or time_left > 0:
+            return False
 
-        # If 'fields' is specified, use it i.e. add it to the data that will be sent off
-        # If 'fields' is not a proper json i.e. some normal string or integer, it will throw an exception
-        try:
-            if fields:
-                if fields.get("custom_fields"):
-                    if not isinstance(fields["custom_fields"], list):
-                        return action_result.set_status(phantom.APP_ERROR, "Invalid value for custom_field")
+        self._deadline_reached = True
 
-                    ret_val, response = self._handle_custom_fields(action_result=action_result, custom_fields=fields["custom_fields"])
+        return True
 
-                    if phantom.is_fail(ret_val):
-                        return action_result.get_status()
+    def _get_request_timeout(self):
+        """Returns the connect and read timeouts of the next request, capped to the time left before the action deadline,
+        None if the deadline is reached"""
 
-                    fields["custom_fields"] = response
-                ticket.update(fields)
-        except Exception as e:
-            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_FIELDS_JSON_PARSE, e)
+        time_left = self._get_time_left()
 
-        data = {"ticket": ticket}
+        if time_left is None:
+            return self._timeout
 
-        # Make the rest call
-        ret_val, response = self._make_rest_call(endpoint, action_result, data=data, method="post")
+        if time_left <= 0:
+            self._deadline_reached = True
+            return None
 
-        # Process/parse the errors encountered while making the REST call.
-        if phantom.is_fail(ret_val):
-            self.debug_print(action_result.get_message())
-            self.set_status(phantom.APP_ERROR, action_result.get_message())
-            return phantom.APP_ERROR
+        return tuple(min(value, time_left) for value in self._timeout)
 
-        # parse the response from the REST call, this is very specific to the device being managed
-        created_ticket = response["ticket"]
+    def _get_retry_delay(self, response, method, attempt):
+        """Returns the number of seconds to wait before retrying a request, None if the request must not be retried"""
 
-        # Set the summary in the action_result
-        action_result.set_summary({consts.ZENDESK_JSON_NEW_TICKET_ID: created_ticket["id"]})
+        if not self._retries_left:
+            return None
 
-        self._add_names_to_ids(created_ticket)
+        if response is None:
+            # Connection errors, the request may have reached the server, so only retry the idempotent methods
+            retryable = method in consts.ZENDESK_IDEMPOTENT_METHODS
+        elif response.status_code == 429:
+            # A rate limited request was not processed by the server, so it is safe to retry it whatever the method
+            retryable = True
+        else:
+            retryable = response.status_code in consts.ZENDESK_RETRY_STATUS_CODES and method in consts.ZENDESK_IDEMPOTENT_METHODS
 
-        # set the data
-        action_result.add_data(created_ticket)
+        if not retryable:
+            return None
 
-        # set the status
-        return action_result.set_status(phantom.APP_SUCCESS)
+        delay = None
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None
 
-    def _handle_custom_fields(self, action_result, custom_fields):
-        """This function is used to handle the custom fields in fields parameter."""
+        if delay is None:
+            # Exponential backoff with jitter, so that concurrent actions do not retry at the same time
+            delay = min(consts.ZENDESK_RETRY_MAX_DELAY, consts.ZENDESK_RETRY_BASE_DELAY * 2**attempt)
+            delay = random.uniform(delay / 2, delay)
 
-        endpoint = "/ticket_fields.json"
-        params = {"per_page": 100}
-        ticket_fields = []
-        seen_pages = set()
-        base_url = urlparse(self._base_url)
+        # Do not hold the action for longer waits, or past its deadline, fail right away instead
+        time_left = self._get_time_left()
+        if delay > consts.ZENDESK_RETRY_MAX_DELAY or (time_left is not None and delay >= time_left):
+            return None
 
-        while endpoint:
-            page = (endpoint, tuple(sorted(params.items())))
-            if page in seen_pages:
-                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKET_FIELDS_PAGINATION), None
-            seen_pages.add(page)
+        with self._lock:
+            # Another request may have spent the last retry meanwhile
+            if not self._retries_left:
+                return None
+            self._retries_left -= 1
 
-            ret_val, response = self._make_rest_call(endpoint, action_result=action_result, params=params)
+        return delay
 
-            if phantom.is_fail(ret_val):
-                return action_result.get_status(), None
+    def _update_rate_limit(self, response):
+        """Keeps track of the rate limit headers, so that the next request waits for the quota to be reset if it is exhausted"""
 
-            ticket_fields.extend(response.get("ticket_fields", []))
-            next_page = response.get("next_page")
-            if not next_page:
-                break
+        remaining = response.headers.get("X-Rate-Limit-Remaining")
 
-            next_page_url = urlparse(next_page)
-            if (
-                next_page_url.scheme != base_url.scheme
-                or next_page_url.netloc != base_url.netloc
-                or not next_page_url.path.startswith(f"{self._api_uri}/")
-            ):
-                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKET_FIELDS_PAGINATION), None
+        if remaining is None:
+            return
 
-            endpoint = next_page_url.path[len(self._api_uri) :]
-            params = dict(parse_qsl(next_page_url.query, keep_blank_values=True))
+        try:
+            self._metrics[consts.ZENDESK_METRIC_RATE_LIMIT_REMAINING] = int(remaining)
+        except ValueError:
+            pass
 
-        response_list = []
-        unmatched_fields = []
-        for custom_field_item in custom_fields:
-            keys_list = list(custom_field_item.keys())
-            values_list = list(custom_field_item.values())
+        if remaining.strip() != "0":
+            return
 
-            if not keys_list or len(keys_list) > 1:
-                return action_result.set_status(phantom.APP_ERROR, "Invalid value for field custom_filed"), None
+        try:
+            reset = float(response.headers.get("ratelimit-reset", consts.ZENDESK_RETRY_BASE_DELAY))
+        except ValueError:
+            reset = consts.ZENDESK_RETRY_BASE_DELAY
 
-            key = keys_list[0]
-            value = values_list[0]
-            for item in ticket_fields:
-                if item["raw_title"] == key:
-                    response_list.append({"id": item["id"], "value": value})
-                    break
-            else:
-                unmatched_fields.append(key)
+        self._rate_limit_reset_at = time.time() + min(reset, consts.ZENDESK_RETRY_MAX_DELAY)
 
-        if unmatched_fields:
-            return (
-                action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_CUSTOM_FIELDS_NOT_FOUND, fields=", ".join(unmatched_fields)),
-                None,
-            )
+        return
 
-        return phantom.APP_SUCCESS, response_list
+    def _wait_for_request_token(self):
+        """Takes a token from the request bucket shared by all the actions of the asset, waits for it if the bucket is empty.
+        Returns False if the token would only be free after the action deadline, it is not taken then."""
 
-    def _update_ticket(self, param):
-        """Action handler for the 'update ticket' action"""
+        if not self._requests_per_minute:
+            return True
 
-        # This is an action that needs to be represented by the ActionResult object
-        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
-        # When the action_result is created this way, the parameter is also passed.
-        # Other things like the summary, data and status is set later on.
-        action_result = self.add_action_result(ActionResult(dict(param)))
+        rate = self._requests_per_minute / 60.0
+        capacity = max(1.0, rate * consts.ZENDESK_RATE_LIMIT_BURST_SECONDS)
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
+        try:
+            with os.fdopen(os.open(self._rate_limit_file, os.O_RDWR | os.O_CREAT, 0o600), "r+") as bucket_file:
+                # The lock serializes the bucket updates of the concurrent actions, it is only held while updating the file
+                fcntl.flock(bucket_file, fcntl.LOCK_EX)
+                try:
+                    bucket = json.loads(bucket_file.read() or "{}")
+                    now = time.time()
+                    tokens = min(capacity, bucket.get("tokens", capacity) + max(0, now - bucket.get("updated_at", now)) * rate)
+
+                    # The token is taken even if the bucket is empty, a negative count reserves the next free slot
+                    tokens -= 1
+
+                    # A slot past the deadline is not reserved, the bucket is left as it was for the other actions
+                    time_left = self._get_time_left()
+                    if tokens < 0 and time_left is not None and -tokens / rate >= time_left:
+                        return False
+
+                    bucket_file.seek(0)
+                    bucket_file.truncate()
+                    bucket_file.write(json.dumps({"tokens": tokens, "updated_at": now}))
+                    bucket_file.flush()
+                finally:
+                    fcntl.flock(bucket_file, fcntl.LOCK_UN)
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            # The limiter is best effort, it should never fail the action
+            self.debug_print(f"Unable to use the shared request bucket: {e}")
+            return True
+
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+
+        return True
+
+    def _load_response_cache(self):
+        """Loads the responses cached by previous actions from the state directory, on the first cacheable request"""
+
+        if self._response_cache is not None:
+            return
 
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
+        try:
+            with open(self._response_cache_file) as cache_file:
+                self._response_cache = json.loads(cache_file.read())
+            if not isinstance(self._response_cache, dict):
+                raise ValueError("The response cache is not a dictionary")
+        except (OSError, TypeError, ValueError) as e:
+            # No response was cached yet or the file got corrupted, start from scratch
+            self.debug_print(f"Unable to load the response cache: {e}")
+            self._response_cache = {}
 
-        ret_val, endpoint = self._get_ticket_endpoint(param, action_result)
+        return
 
-        if phantom.is_fail(ret_val):
-            return action_result.get_status()
+    def _save_response_cache(self):
+        """Saves the most recently used responses into the state directory, up to the configured size"""
 
-        # Parse and set the fields parameter, it is required for this action
-        ret_val, fields = self._get_fields(param, action_result)
+        if not self._response_cache_changed:
+            return
 
-        # Process error
-        if phantom.is_fail(ret_val):
-            return action_result.get_status()
+        # The dictionary is kept in least recently used order, so the oldest entries are the ones evicted. The file is
+        # only written when a response changed, the order of the cache hits alone is not worth rewriting it
+        entries = []
+        size = 0
+        for key, entry in reversed(self._response_cache.items()):
+            size += len(entry["body"])
+            if size > self._response_cache_size * 1024:
+                break
+            entries.append((key, entry))
 
-        if not fields:
-            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_EMPTY_FIELDS)
+        try:
+            self._replace_file(self._response_cache_file, json.dumps(dict(reversed(entries))))
+        except (OSError, TypeError, ValueError) as e:
+            # The cache is best effort, it should never fail the action
+            self.debug_print(f"Unable to save the response cache: {e}")
 
-        if fields.get("custom_fields"):
-            if not isinstance(fields["custom_fields"], list):
-                return action_result.set_status(phantom.APP_ERROR, "Invalid value for custom_field")
+        self._response_cache_changed = False
 
-            ret_val, response = self._handle_custom_fields(action_result=action_result, custom_fields=fields["custom_fields"])
+        return
 
-            if phantom.is_fail(ret_val):
-                return action_result.get_status()
+    def _replace_file(self, path, content):
+        """Writes a file of the state directory, it is replaced at once, so that the concurrent actions never read a
+        partially written one"""
 
-            fields["custom_fields"] = response
+        temp_file = f"{path}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as state_file:
+            state_file.write(content)
+        os.replace(temp_file, path)
 
-        data = {"ticket": fields}
+        return
 
-        # Make the REST CAll
-        ret_val, response = self._make_rest_call(endpoint, action_result, data=data, method="put")
+    def _load_result_cache(self):
+        """Loads the results cached by the previous list tickets and run query actions, the expired ones and the ones
+        of the actions started before the result cache was last cleared are dropped"""
 
-        # Process the error
-        if phantom.is_fail(ret_val):
-            self.debug_print(action_result.get_message())
-            return action_result.get_status()
+        try:
+            with open(self._result_cache_file) as cache_file:
+                result_cache = json.loads(cache_file.read())
+            if not isinstance(result_cache, dict):
+                raise ValueError("The result cache is not a dictionary")
+        except (OSError, TypeError, ValueError) as e:
+            # No result was cached yet or the file got corrupted, start from scratch
+            self.debug_print(f"Unable to load the result cache: {e}")
+            return {}
 
-        # Get the result
-        ticket = response.get("ticket")
+        expired_at = time.time() - self._result_cache_ttl
 
-        self._add_names_to_ids(ticket)
+        try:
+            with open(self._result_cache_cleared_file) as cleared_file:
+                expired_at = max(expired_at, float(cleared_file.read()))
+        except (OSError, ValueError):
+            # The result cache was never cleared
+            pass
+
+        return {key: entry for key, entry in result_cache.items() if entry.get("cached_at", 0) > expired_at}
+
+    def _get_result_cache_key(self, param):
+        """Returns the key of the results of an action, built from the parameters they depend on. The whitespace of the
+        query is normalized and the returned fields are resolved, so that the asset default is part of the key."""
+
+        key_params = {name: param.get(name) for name in consts.ZENDESK_RESULT_CACHE_KEY_PARAMS}
+        if key_params[consts.ZENDESK_JSON_QUERY]:
+            key_params[consts.ZENDESK_JSON_QUERY] = " ".join(key_params[consts.ZENDESK_JSON_QUERY].split())
+
+        fields_to_return = self._get_fields_to_return(param)
+
+        return json.dumps([self.get_action_identifier(), key_params, sorted(fields_to_return or [])], sort_keys=True)
+
+    def _cache_result(self, key, action_result, started_at):
+        """Caches the data, the summary and the message of an action result, along with the time the action started
+        at. The oldest results are evicted to keep the cache under its maximum size, the results larger than that are
+        not cached."""
+
+        result = json.dumps({"data": action_result.get_data(), "summary": action_result.get_summary(), "message": action_result.get_message()})
+        if len(result) > consts.ZENDESK_RESULT_CACHE_MAX_SIZE * 1024:
+            return
+
+        result_cache = self._load_result_cache()
+        result_cache.pop(key, None)
+        result_cache[key] = {"cached_at": started_at, "result": result}
+
+        # The dictionary is kept in the order the results were cached in
+        size = sum(len(entry["result"]) for entry in result_cache.values())
+        for old_key in list(result_cache):
+            if size <= consts.ZENDESK_RESULT_CACHE_MAX_SIZE * 1024:
+                break
+            size -= len(result_cache.pop(old_key)["result"])
+
+        try:
+            self._replace_file(self._result_cache_file, json.dumps(result_cache))
+        except (OSError, TypeError, ValueError) as e:
+            # The cache is best effort, it should never fail the action
+            self.debug_print(f"Unable to save the result cache: {e}")
+
+        return
+
+    def _run_cached(self, handler, param):
+        """Runs the handler of a list tickets or run query action, unless the action ran with the same parameters less
+        than result_cache_ttl seconds ago, in which case its results are returned again without any request. The cache
+        is refreshed when bypass_cache is set, the partial and failed results are never cached."""
+
+        if not self._result_cache_ttl:
+            return handler(param)
+
+        key = self._get_result_cache_key(param)
+
+        if not param.get(consts.ZENDESK_JSON_BYPASS_CACHE):
+            entry = self._load_result_cache().get(key)
+            if entry is not None:
+                self.debug_print("Returning the cached results of the action")
+                result = json.loads(entry["result"])
+
+                action_result = self.add_action_result(ActionResult(dict(param)))
+                for data in result["data"]:
+                    action_result.add_data(data)
+                action_result.set_summary(result["summary"])
+
+                return action_result.set_status(phantom.APP_SUCCESS, result["message"] or "")
+
+        # A ticket changed while the action runs makes its results stale, the start time is the one compared to the
+        # time the cache was last cleared
+        started_at = time.time()
+
+        ret_val = handler(param)
+
+        if not phantom.is_fail(ret_val) and not self._deadline_reached:
+            self._cache_result(key, self.get_action_results()[-1], started_at)
+
+        return ret_val
+
+    def _clear_result_cache(self):
+        """Drops the cached results, the results of the actions still running are dropped as well once they are cached,
+        since they may have been retrieved before the change"""
+
+        try:
+            self._replace_file(self._result_cache_cleared_file, str(time.time()))
+            os.remove(self._result_cache_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.debug_print(f"Unable to clear the result cache: {e}")
+
+        return
+
+    def _run_invalidating(self, handler, param):
+        """Runs the handler of an action changing tickets, then clears the cached results of the list tickets and run
+        query actions. The cache is cleared whatever the outcome, a failed action may have changed some tickets."""
+
+        try:
+            return handler(param)
+        finally:
+            self._clear_result_cache()
+
+    def _get_cached_response(self, key):
+        """Returns the cached response of a request, None if it is not cached"""
+
+        # The requests made concurrently share the cache
+        with self._lock:
+            self._load_response_cache()
+
+            entry = self._response_cache.pop(key, None)
+            if entry is None:
+                return None
+
+            # Re-insert the entry to mark it as the most recently used one
+            self._response_cache[key] = entry
+
+        return entry
+
+    def _cache_response(self, key, response):
+        """Caches a response along with its validators, the responses without validators are never sent back as not
+        modified, so they are not cached"""
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        with self._lock:
+            self._response_cache.pop(key, None)
+            self._response_cache_changed = True
+
+            if (etag or last_modified) and len(response.text) <= self._response_cache_size * 1024:
+                self._response_cache[key] = {"etag": etag, "last_modified": last_modified, "body": response.text}
+
+        return
+
+    def _report_request_progress(self):
+        """Reports the progress of the requests to the platform, every message being a write to the platform, at most
+        one is sent per ZENDESK_PROGRESS_INTERVAL seconds"""
+
+        # Only the thread of the action reports progress, not the ones making concurrent requests
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        now = time.monotonic()
+
+        if self._progress_reported_at is None:
+            self.save_progress(f"Using {self._auth_method} for authentication")
+        elif now - self._progress_reported_at >= consts.ZENDESK_PROGRESS_INTERVAL:
+            self.save_progress(consts.ZENDESK_MSG_REQUESTS_MADE.format(count=self._metrics[consts.ZENDESK_METRIC_REQUESTS]))
+        else:
+            return
+
+        self._progress_reported_at = now
+
+        return
+
+    def _get_error_details(self, resp_json):
+        """Returns the error body of a response as the detail of the status message, only the start of a large body is
+        serialized"""
+
+        details = ""
+        for chunk in json.JSONEncoder().iterencode(resp_json):
+            details += chunk
+            if len(details) > consts.ZENDESK_ERR_MAX_DETAIL_LENGTH:
+                details = details[: consts.ZENDESK_ERR_MAX_DETAIL_LENGTH] + "..."
+                break
+
+        return details.replace("{", "").replace("}", "")
+
+    def _make_rest_call(
+        self, endpoint, action_result, headers=None, params=None, data=None, method="get", stream=False, cache=False, upload_file=None
+    ):
+        """Function that makes the REST call to the device, generic function that can be called from various action
+        handlers. With stream set, a JSON body is decoded as it is read instead of being loaded whole first. With cache
+        set, a GET response is cached and only downloaded again if it has changed since. An upload_file is sent as the
+        binary body of the request, it is read in blocks while being sent."""
+
+        # The common headers and the authentication are already set on the session and the content type headers are
+        # prebuilt, a new dictionary is only made for the call specific ones
+        if upload_file is not None:
+            request_headers = consts.ZENDESK_UPLOAD_HEADERS
+            body = upload_file
+        else:
+            request_headers = consts.ZENDESK_REQUEST_HEADERS if method in consts.ZENDESK_REQUEST_METHODS else None
+            body = json.dumps(data) if data else None
+        if headers:
+            request_headers = {**(request_headers or {}), **headers}
+
+        # A cached response is validated by the server, which answers 304 Not Modified if it is still current
+        cache_key = cached = None
+        if cache and method == "get" and not stream and self._response_cache_size:
+            cache_key = endpoint + ("?" + urlencode(sorted(params.items())) if params else "")
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                request_headers = dict(request_headers or {})
+                if cached.get("etag"):
+                    request_headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp_json = None
+
+        # get or post or put, whatever the caller asked us to use, if not specified the default will be 'get'
+        request_func = getattr(self._session, method, None)
+
+        # handle the error in case the caller specified a non-existent method
+        if not request_func:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_API_UNSUPPORTED_METHOD), resp_json
+
+        self._report_request_progress()
+
+        attempt = 0
+
+        while True:
+            # The quota was exhausted by the previous request, wait for it to be reset
+            wait = self._rate_limit_reset_at - time.time()
+            time_left = self._get_time_left()
+            if time_left is not None and wait >= time_left:
+                self._deadline_reached = True
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_DEADLINE_REACHED), resp_json
+            if wait > 0:
+                time.sleep(wait)
+
+            if not self._wait_for_request_token():
+                self._deadline_reached = True
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_DEADLINE_REACHED), resp_json
+
+            # A request is never allowed to run past the action deadline
+            timeout = self._get_request_timeout()
+            if timeout is None:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_DEADLINE_REACHED), resp_json
+
+            # A retried upload is sent from the start of the file again
+            if upload_file is not None:
+                upload_file.seek(0)
+
+            # Make the call
+            started_at = time.perf_counter()
+            try:
+                r = request_func(
+                    self._base_url + self._api_uri + endpoint,  # The complete url is made up of the base_url, the api url and the endpiont
+                    data=body,  # the data converted to a json string or the file to upload if present, else just set to None
+                    headers=request_headers,  # The headers to send in the HTTP call, merged with the session headers
+                    params=params,  # uri parameters if any
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except Exception as e:
+                self._record_request(endpoint, time.perf_counter() - started_at, 0)
+                self.debug_print(f"{method.upper()} call to {endpoint} failed: {e}")
+
+                delay = self._get_retry_delay(None, method, attempt)
+                if delay is None:
+                    return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_SERVER_CONNECTION, e), resp_json
+            else:
+                self._update_rate_limit(r)
+
+                delay = self._get_retry_delay(r, method, attempt)
+                if delay is None:
+                    break
+
+                # The body of a retried response is not used, it is read to release the connection
+                elapsed = time.perf_counter() - started_at
+                self._record_request(endpoint, elapsed, len(r.content or b""))
+                self.debug_print(f"{method.upper()} call to {endpoint} returned {r.status_code} in {elapsed:.3f} seconds")
+
+            self.debug_print(f"Retrying the {method.upper()} call to {endpoint} in {delay:.1f} seconds")
+            with self._lock:
+                self._metrics[consts.ZENDESK_METRIC_RETRIES] += 1
+            time.sleep(delay)
+            attempt += 1
+
+        if cached is not None and r.status_code == 304:
+            elapsed = time.perf_counter() - started_at
+            self._record_request(endpoint, elapsed, 0)
+            self.debug_print(f"{method.upper()} call to {endpoint} returned {r.status_code} in {elapsed:.3f} seconds")
+            r.close()
+
+            with self._lock:
+                self._metrics[consts.ZENDESK_METRIC_RESPONSE_CACHE_HITS] += 1
+
+            # Every call gets its own copy of the response, the callers add the names to the tickets in place
+            return phantom.APP_SUCCESS, json.loads(cached["body"])
+
+        received = 0
+
+        def read_chunks():
+            nonlocal received
+            for chunk in r.iter_content(chunk_size=consts.ZENDESK_STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+
+        # Try a json parse, since most REST API's give back the data in json.
+        # If the device does not return JSONs, then need to implement parsing them some other manner.
+        try:
+            if stream and r.ok and "json" in r.headers.get("Content-Type", ""):
+                # The tickets are decoded one by one from the stream, the raw body is never held whole
+                resp_json = _JsonStream(read_chunks()).decode()
+            else:
+                resp_json = r.json()
+                received = len(r.content or b"")
+        except Exception as e:
+            # r.text is guaranteed to be NON None, it will be empty, but not None
+            try:
+                msg_string = consts.ZENDESK_ERR_JSON_PARSE.format(raw_text=r.text[: consts.ZENDESK_ERR_MAX_DETAIL_LENGTH].encode("utf-8"))
+            except:
+                msg_string = "Unable to parse response as a Json"
+            return action_result.set_status(phantom.APP_ERROR, msg_string, e), resp_json
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self._record_request(endpoint, elapsed, received)
+            self.debug_print(f"{method.upper()} call to {endpoint} returned {r.status_code} in {elapsed:.3f} seconds")
+            r.close()
+
+        if r.status_code in consts.ZENDESK_EMPTY_RESPONSE_STATUS_CODES:
+            return phantom.APP_SUCCESS, resp_json
+
+        # Handle/process any errors that we get back from the device
+        if 200 <= r.status_code <= 399:
+            # Success
+            if cache_key is not None:
+                with self._lock:
+                    self._metrics[consts.ZENDESK_METRIC_RESPONSE_CACHE_MISSES] += 1
+                self._cache_response(cache_key, r)
+            return phantom.APP_SUCCESS, resp_json
+
+        # Failure
+        action_result.add_data(resp_json)
+
+        details = self._get_error_details(resp_json)
+
+        return action_result.set_status(
+            phantom.APP_ERROR, consts.ZENDESK_ERR_FROM_SERVER.format(status=r.status_code, detail=details)
+        ), resp_json
+
+    def _test_connectivity(self, param):
+        """Function that handles the test connectivity action, it is much simpler than other action handlers."""
+
+        # Progress, since it is test connectivity, it pays to be verbose
+        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
+
+        # set the endpoint
+        endpoint = "/tickets/recent.json"
+
+        params = {"per_page": 1}
+
+        # Action result to represent the call
+        action_result = ActionResult()
+
+        # Progress message, since it is test connectivity, it pays to be verbose
+        self.save_progress(consts.ZENDESK_MSG_GET_INCIDENT_TEST)
+
+        # Make the rest endpoint call
+        ret_val, _response = self._make_rest_call(endpoint, action_result, params=params)
+
+        # Process errors
+        if phantom.is_fail(ret_val):
+            # Dump error messages in the log
+            self.debug_print(action_result.get_message())
+
+            # Set the status of the complete connector result
+            self.set_status(phantom.APP_ERROR, action_result.get_message())
+
+            # Append the message to display
+            self.append_to_message(consts.ZENDESK_ERR_CONNECTIVITY_TEST)
+
+            # return error
+            return phantom.APP_ERROR
+
+        # Set the status of the connector result
+        return self.set_status_save_progress(phantom.APP_SUCCESS, consts.ZENDESK_SUCC_CONNECTIVITY_TEST)
+
+    def _get_fields(self, param, action_result):
+        """Validates the field parameter that is a json, created a function to make the caller code cleaner"""
+
+        fields = param.get(consts.ZENDESK_JSON_FIELDS)
+
+        # fields is an optional field
+        if not fields:
+            return phantom.APP_SUCCESS, None
+
+        # we take in as a dictionary string, first try to load it as is
+        try:
+            fields = json.loads(fields)
+        except Exception as e:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_FIELDS_JSON_PARSE, e), None
+
+        return phantom.APP_SUCCESS, fields
+
+    def _get_ticket_endpoint(self, param, action_result):
+        """Validates a ticket ID before using it in a Zendesk API path."""
+
+        ticket_id = str(param.get(consts.ZENDESK_JSON_TICKET_ID, ""))
+
+        if not ticket_id.isascii() or not ticket_id.isdecimal() or int(ticket_id) < 1:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_TICKET_ID), None
+
+        return phantom.APP_SUCCESS, f"/tickets/{ticket_id}.json"
+
+    def _get_ticket_ids(self, param, action_result):
+        """Validates the ticket ID parameter, which holds either a single ID, a comma separated list or a JSON list of IDs"""
+
+        ticket_ids = param.get(consts.ZENDESK_JSON_TICKET_ID, "")
+
+        if isinstance(ticket_ids, str) and ticket_ids.strip().startswith("["):
+            try:
+                ticket_ids = json.loads(ticket_ids)
+            except Exception:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_TICKET_ID), None
+
+        if not isinstance(ticket_ids, list):
+            ticket_ids = str(ticket_ids).split(",")
+
+        ticket_ids = [str(ticket_id).strip() for ticket_id in ticket_ids]
+
+        for ticket_id in ticket_ids:
+            ret_val, _endpoint = self._get_ticket_endpoint({consts.ZENDESK_JSON_TICKET_ID: ticket_id}, action_result)
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+        if not ticket_ids:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_TICKET_ID), None
+
+        # Duplicates are dropped, the order of the IDs is kept
+        return phantom.APP_SUCCESS, list(dict.fromkeys(ticket_ids))
+
+    def _fetch_tickets(self, action_result, ticket_ids):
+        """Fetches the given tickets with show_many, in chunks of the maximum number of IDs the endpoint accepts"""
+
+        tickets = []
+
+        def fetch_chunk(index):
+            params = {"ids": ",".join(ticket_ids[index : index + consts.ZENDESK_SHOW_MANY_LIMIT]), "include": consts.ZENDESK_TICKET_SIDELOADS}
+            return self._make_rest_call("/tickets/show_many.json", action_result, params=params, stream=True)
+
+        for ret_val, response in self._run_concurrently(fetch_chunk, range(0, len(ticket_ids), consts.ZENDESK_SHOW_MANY_LIMIT)):
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+            self._add_sideloads(response)
+
+            tickets.extend(response.get("tickets", []))
+
+        return phantom.APP_SUCCESS, tickets
+
+    def _wait_for_job(self, action_result, job_status):
+        """Polls the status of a background job with an increasing interval until it is done, returns its final status"""
+
+        interval = consts.ZENDESK_JOB_POLL_INTERVAL
+        deadline = time.time() + consts.ZENDESK_JOB_POLL_TIMEOUT
+
+        while job_status.get("status") not in consts.ZENDESK_JOB_DONE_STATUSES:
+            if not job_status.get("id") or time.time() > deadline:
+                return (
+                    action_result.set_status(
+                        phantom.APP_ERROR, consts.ZENDESK_ERR_JOB_NOT_COMPLETED.format(id=job_status.get("id"), status=job_status.get("status"))
+                    ),
+                    None,
+                )
+
+            time.sleep(interval)
+            interval = min(interval * 2, consts.ZENDESK_JOB_POLL_MAX_INTERVAL)
+
+            ret_val, response = self._make_rest_call(f"/job_statuses/{job_status['id']}.json", action_result)
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+            job_status = response.get("job_status") or {}
+
+        if job_status["status"] != "completed":
+            return (
+                action_result.set_status(
+                    phantom.APP_ERROR, consts.ZENDESK_ERR_JOB_NOT_COMPLETED.format(id=job_status.get("id"), status=job_status.get("status"))
+                ),
+                None,
+            )
+
+        return phantom.APP_SUCCESS, job_status
+
+    def _load_user_cache(self):
+        """Loads the user names cached by previous actions from the asset state, expired entries are dropped"""
+
+        now = time.time()
+
+        try:
+            self.__id_to_name = {
+                int(user_id): (name, cached_at)
+                for user_id, (name, cached_at) in self._state.get(consts.ZENDESK_STATE_USER_NAMES, {}).items()
+                if now - cached_at < self._user_cache_ttl
+            }
+        except (AttributeError, TypeError, ValueError):
+            # The state was written by an older version or got corrupted, start from scratch
+            self.__id_to_name = {}
+
+        return
+
+    def _save_user_cache(self):
+        """Saves the most recently used user names into the asset state, so that the next actions can reuse them"""
+
+        if not self._user_cache_ttl:
+            self._state.pop(consts.ZENDESK_STATE_USER_NAMES, None)
+            return
+
+        # The dictionary is kept in least recently used order, so the oldest entries are the ones evicted
+        entries = list(self.__id_to_name.items())[-self._user_cache_max_entries :]
+
+        # The entries are saved as lists, like they are loaded back from the JSON state, so that unchanged ones compare equal
+        self._state[consts.ZENDESK_STATE_USER_NAMES] = {str(user_id): list(entry) for user_id, entry in entries}
+
+        return
+
+    def _get_cached_user_name(self, user_id):
+        """Returns the cached name of the user, None if the user is not cached or could not be resolved"""
+
+        entry = self.__id_to_name.pop(user_id, None)
+        if entry is None:
+            return None
+
+        # Re-insert the entry to mark it as the most recently used one
+        self.__id_to_name[user_id] = entry
+
+        return entry[0]
+
+    def _resolve_user_names(self, user_ids):
+        """Function resolves the names of the given user ids in bulk, unseen ids are fetched in chunks using show_many"""
+
+        user_ids = {user_id for user_id in user_ids if user_id}
+        unseen_ids = sorted(user_id for user_id in user_ids if user_id not in self.__id_to_name)
+
+        self._metrics[consts.ZENDESK_METRIC_USER_CACHE_HITS] += len(user_ids) - len(unseen_ids)
+        self._metrics[consts.ZENDESK_METRIC_USER_CACHE_MISSES] += len(unseen_ids)
+
+        # The names are only an enrichment, they are left out once the deadline is reached
+        if not unseen_ids or self._is_past_deadline():
+            return
+
+        def fetch_chunk(chunk):
+            users_ar = ActionResult()
+
+            endpoint = "/users/show_many.json"
+
+            params = {"ids": ",".join(str(user_id) for user_id in chunk)}
+
+            # Make the rest call, a failure only means the names will be missing from the tickets
+            ret_val, response = self._make_rest_call(endpoint, users_ar, params=params, cache=True)
+            if phantom.is_fail(ret_val):
+                self.debug_print(users_ar.get_message())
+                return None
+
+            return response
+
+        chunks = [
+            unseen_ids[index : index + consts.ZENDESK_SHOW_MANY_LIMIT] for index in range(0, len(unseen_ids), consts.ZENDESK_SHOW_MANY_LIMIT)
+        ]
+
+        for chunk, response in zip(chunks, self._run_concurrently(fetch_chunk, chunks)):
+            if response is None:
+                continue
+
+            now = time.time()
+            user_names = {user.get("id"): user.get("name") for user in response.get("users", [])}
+
+            # Users missing from the response are deleted or unknown, cache them too so they are not requested again
+            for user_id in chunk:
+                self.__id_to_name[user_id] = (user_names.get(user_id), now)
+
+        return
+
+    def _add_sideloads(self, response):
+        """Caches the names of the users, groups and organizations sideloaded in a response, so that the tickets of the
+        response can be enriched without any other request"""
+
+        now = time.time()
+
+        for user in response.get("users") or []:
+            if user.get("id"):
+                self.__id_to_name[user["id"]] = (user.get("name"), now)
+
+        for group in response.get("groups") or []:
+            self._group_names[group.get("id")] = group.get("name")
+
+        for organization in response.get("organizations") or []:
+            self._organization_names[organization.get("id")] = organization.get("name")
+
+        return
+
+    def _add_names_to_ids(self, tickets):
+        """Function parses the tickets and adds names to all the ids present in them"""
+
+        user_id_keys = ["submitter_id", "assignee_id", "requester_id"]
+
+        # Resolve every user of the page at once, instead of one call per id, sideloaded users are not requested again
+        self._resolve_user_names(ticket.get(user_id_key) for ticket in tickets for user_id_key in user_id_keys)
+
+        for ticket in tickets:
+            for user_id_key in user_id_keys:
+                user_name = self._get_cached_user_name(ticket.get(user_id_key))
+
+                if user_name:
+                    ticket[f"{user_id_key}_name"] = user_name
+
+            # Group and organization names are only known when sideloaded
+            group_name = self._group_names.get(ticket.get("group_id"))
+            if group_name:
+                ticket["group_id_name"] = group_name
+
+            organization_name = self._organization_names.get(ticket.get("organization_id"))
+            if organization_name:
+                ticket["organization_id_name"] = organization_name
+
+        return
+
+    def _create_ticket(self, param):
+        """Action handler for the 'create ticket' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        # Set the endpoint
+        endpoint = "/tickets.json"
+
+        ticket = {"subject": param[consts.ZENDESK_JSON_SUBJECT], "comment": {"body": param[consts.ZENDESK_JSON_DESCRIPTION]}}
+
+        # Parse and set the fields parameter, it is optional
+        ret_val, fields = self._get_fields(param, action_result)
+
+        # Process error
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # If 'fields' is specified, use it i.e. add it to the data that will be sent off
+        # If 'fields' is not a proper json i.e. some normal string or integer, it will throw an exception
+        try:
+            if fields:
+                ret_val = self._resolve_custom_fields(action_result, fields)
+
+                if phantom.is_fail(ret_val):
+                    return action_result.get_status()
+
+                ticket.update(fields)
+        except Exception as e:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_FIELDS_JSON_PARSE, e)
+
+        data = {"ticket": ticket}
+
+        # Make the rest call, the related records are sideloaded to add their names without other calls
+        ret_val, response = self._make_rest_call(
+            endpoint, action_result, params={"include": consts.ZENDESK_TICKET_SIDELOADS}, data=data, method="post"
+        )
+
+        # Process/parse the errors encountered while making the REST call.
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            self.set_status(phantom.APP_ERROR, action_result.get_message())
+            return phantom.APP_ERROR
+
+        self._add_sideloads(response)
+
+        # parse the response from the REST call, this is very specific to the device being managed
+        created_ticket = response["ticket"]
+
+        # Set the summary in the action_result
+        action_result.set_summary({consts.ZENDESK_JSON_NEW_TICKET_ID: created_ticket["id"]})
+
+        self._add_names_to_ids([created_ticket])
+
+        # set the data
+        action_result.add_data(created_ticket)
+
+        # set the status
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _get_next_page_endpoint(self, next_page):
+        """Splits a next page link into the endpoint and the parameters to request, links that do not point to the
+        API of the asset are rejected by returning None"""
+
+        base_url = urlparse(self._base_url)
+        next_page_url = urlparse(next_page)
+
+        if (
+            next_page_url.scheme != base_url.scheme
+            or next_page_url.netloc != base_url.netloc
+            or not next_page_url.path.startswith(f"{self._api_uri}/")
+        ):
+            return None, None
+
+        return next_page_url.path[len(self._api_uri) :], dict(parse_qsl(next_page_url.query, keep_blank_values=True))
+
+    def _add_all_pages(self, action_result, endpoint, params, items_key, max_results=None, fields_to_return=None):
+        """Follows the cursor pagination of the endpoint, the tickets of every page are enriched and added to the action
+        result as soon as the page arrives, until there are no more pages or max_results tickets have been added"""
+
+        total = 0
+        seen_pages = {(endpoint, tuple(sorted(params.items())))}
+        include = params.get("include")
+
+        next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+        while next_page:
+            ret_val, response = next_page()
+            next_page = None
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), total
+
+            self._add_sideloads(response)
+
+            tickets = response.get(items_key, [])
+            if max_results is not None:
+                tickets = tickets[: max_results - total]
+
+            pagination_failed = False
+
+            # The next page is requested before the tickets of this one are enriched, so that it can be fetched meanwhile
+            if (max_results is None or total + len(tickets) < max_results) and response.get("meta", {}).get("has_more"):
+                endpoint, params = self._get_next_page_endpoint(response.get("links", {}).get("next") or "")
+
+                # The next links do not always carry the sideloads over
+                if endpoint is not None and include:
+                    params.setdefault("include", include)
+
+                page = (endpoint, tuple(sorted(params.items()))) if endpoint is not None else None
+
+                if page is None or page in seen_pages:
+                    pagination_failed = True
+                elif not self._is_past_deadline():
+                    # Past the deadline, the tickets added so far are returned rather than failing the action
+                    seen_pages.add(page)
+                    next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+            self._add_names_to_ids(tickets)
+
+            self._add_tickets(action_result, tickets, fields_to_return)
+
+            total += len(tickets)
+
+            if pagination_failed:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_PAGINATION), total
+
+        return phantom.APP_SUCCESS, total
+
+    def _set_paginated_status(self, action_result, total):
+        """Sets the success status of an action that followed the pagination, stating when the results are partial
+        because the action deadline was reached"""
+
+        if self._deadline_reached:
+            return action_result.set_status(phantom.APP_SUCCESS, consts.ZENDESK_MSG_DEADLINE_PARTIAL_RESULTS.format(count=total))
+
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _get_pagination_params(self, param, action_result):
+        """Validates the pagination parameters of the list tickets and run query actions"""
+
+        ret_val, per_page = self._validate_integer(
+            action_result, param.get(consts.ZENDESK_JSON_PER_PAGE, consts.DEFAULT_MAX_RESULTS), consts.ZENDESK_JSON_PER_PAGE
+        )
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), None, None
+
+        ret_val, max_results = self._validate_integer(action_result, param.get(consts.ZENDESK_JSON_MAX_RESULTS), consts.ZENDESK_JSON_MAX_RESULTS)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), None, None
+
+        return phantom.APP_SUCCESS, per_page, max_results
+
+    def _get_fields_to_return(self, param):
+        """Returns the set of the ticket keys to return, from the action parameter or else the asset default, None if
+        the tickets must be returned whole"""
+
+        fields_to_return = param.get(consts.ZENDESK_JSON_FIELDS_TO_RETURN) or self.get_config().get(consts.ZENDESK_JSON_DEFAULT_FIELDS_TO_RETURN)
+
+        if not fields_to_return:
+            return None
+
+        return {field.strip() for field in fields_to_return.split(",") if field.strip()} or None
+
+    def _add_tickets(self, action_result, tickets, fields_to_return=None):
+        """Adds the tickets to the action result, trimmed to the requested keys if any. The id and the names added for
+        the requested ids are always kept, the tickets are added as they are when there is no projection."""
+
+        if not fields_to_return:
+            for ticket in tickets:
+                action_result.add_data(ticket)
+            return
+
+        for ticket in tickets:
+            action_result.add_data(
+                {
+                    key: value
+                    for key, value in ticket.items()
+                    if key in fields_to_return or key == "id" or (key.endswith("_name") and key[: -len("_name")] in fields_to_return)
+                }
+            )
+
+        return
+
+    def _fetch_ticket_field_index(self, action_result):
+        """Pages through the ticket field catalog and returns a dictionary of the field raw titles to their ids"""
+
+        endpoint = "/ticket_fields.json"
+        params = {"per_page": 100}
+        ticket_field_index = {}
+        seen_pages = set()
+
+        while endpoint:
+            page = (endpoint, tuple(sorted(params.items())))
+            if page in seen_pages:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKET_FIELDS_PAGINATION), None
+            seen_pages.add(page)
+
+            ret_val, response = self._make_rest_call(endpoint, action_result=action_result, params=params, cache=True)
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+            # In case of duplicate titles, the first field of the catalog is the one used
+            for item in response.get("ticket_fields", []):
+                ticket_field_index.setdefault(item["raw_title"], item["id"])
+
+            next_page = response.get("next_page")
+            if not next_page:
+                break
+
+            # Knowing the size of the catalog, the remaining pages are all fetched at once instead of one after the other
+            page_size = len(response.get("ticket_fields", []))
+            if self._max_concurrent_requests > 1 and page_size and response.get("count") and "page" not in params:
+                pages = range(2, math.ceil(response["count"] / page_size) + 1)
+
+                def fetch_page(page_number):
+                    return self._make_rest_call(endpoint, action_result=action_result, params=dict(params, page=page_number), cache=True)
+
+                for ret_val, page_response in self._run_concurrently(fetch_page, pages):
+                    if phantom.is_fail(ret_val):
+                        return action_result.get_status(), None
+
+                    for item in page_response.get("ticket_fields", []):
+                        ticket_field_index.setdefault(item["raw_title"], item["id"])
+
+                break
+
+            endpoint, params = self._get_next_page_endpoint(next_page)
+            if endpoint is None:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKET_FIELDS_PAGINATION), None
+
+        return phantom.APP_SUCCESS, ticket_field_index
+
+    def _get_ticket_field_index(self, action_result, refresh=False):
+        """Returns the ticket field index cached in the asset state, the catalog is only fetched again if the cached
+        index has expired or a refresh is requested"""
+
+        # The catalog is fetched at most once per action, however many tickets are written
+        if self._ticket_field_index is not None:
+            self._metrics[consts.ZENDESK_METRIC_TICKET_FIELDS_CACHE_HITS] += 1
+            return phantom.APP_SUCCESS, self._ticket_field_index, False
+
+        cached = self._state.get(consts.ZENDESK_STATE_TICKET_FIELDS)
+
+        if not refresh and isinstance(cached, dict) and time.time() - cached.get("cached_at", 0) < self._ticket_fields_cache_ttl:
+            self._metrics[consts.ZENDESK_METRIC_TICKET_FIELDS_CACHE_HITS] += 1
+            return phantom.APP_SUCCESS, cached.get("index", {}), True
+
+        self._metrics[consts.ZENDESK_METRIC_TICKET_FIELDS_CACHE_MISSES] += 1
+
+        ret_val, ticket_field_index = self._fetch_ticket_field_index(action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), None, False
+
+        self._ticket_field_index = ticket_field_index
+
+        if self._ticket_fields_cache_ttl:
+            self._state[consts.ZENDESK_STATE_TICKET_FIELDS] = {"cached_at": time.time(), "index": ticket_field_index}
+
+        return phantom.APP_SUCCESS, ticket_field_index, False
+
+    def _resolve_custom_fields(self, action_result, fields):
+        """Replaces the custom fields titles of the fields dictionary with their ids, in place"""
+
+        if fields.get("custom_fields"):
+            if not isinstance(fields["custom_fields"], list):
+                return action_result.set_status(phantom.APP_ERROR, "Invalid value for custom_field")
+
+            ret_val, response = self._handle_custom_fields(action_result=action_result, custom_fields=fields["custom_fields"])
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status()
+
+            fields["custom_fields"] = response
+
+        return phantom.APP_SUCCESS
+
+    def _create_tickets(self, param):
+        """Action handler for the 'create tickets' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        try:
+            specs = json.loads(param[consts.ZENDESK_JSON_TICKETS])
+        except Exception as e:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKETS_JSON_PARSE, e)
+
+        if not specs or not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKETS_JSON_PARSE)
+
+        tickets = []
+        for spec in specs:
+            fields = dict(spec)
+            subject = fields.pop(consts.ZENDESK_JSON_SUBJECT, None)
+            description = fields.pop(consts.ZENDESK_JSON_DESCRIPTION, None)
+
+            if not subject or not description:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_TICKETS_JSON_PARSE)
+
+            # The ticket field catalog is only fetched for the first ticket with custom fields, the others reuse it
+            ret_val = self._resolve_custom_fields(action_result, fields)
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status()
+
+            ticket = {"subject": subject, "comment": {"body": description}}
+            ticket.update(fields)
+            tickets.append(ticket)
+
+        created = 0
+
+        for index in range(0, len(tickets), consts.ZENDESK_CREATE_MANY_LIMIT):
+            data = {"tickets": tickets[index : index + consts.ZENDESK_CREATE_MANY_LIMIT]}
+
+            ret_val, response = self._make_rest_call("/tickets/create_many.json", action_result, data=data, method="post")
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            ret_val, job_status = self._wait_for_job(action_result, response.get("job_status") or {})
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            # The results hold the index of every ticket within its chunk, report it within the whole list instead
+            for result in job_status.get("results") or []:
+                success = bool(result.get("id")) and not result.get("error")
+                created += success
+                action_result.add_data(
+                    {
+                        "index": index + result.get("index", 0),
+                        "id": result.get("id"),
+                        "success": success,
+                        "error": ": ".join(str(detail) for detail in (result.get("error"), result.get("details")) if detail) or None,
+                    }
+                )
+
+            self.save_progress(consts.ZENDESK_MSG_CREATED_TICKETS.format(count=created, total=len(tickets)))
+
+        action_result.set_summary({consts.ZENDESK_JSON_CREATED_TICKETS: created, consts.ZENDESK_JSON_FAILED_TICKETS: len(tickets) - created})
+
+        if created < len(tickets):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_CREATE_TICKETS.format(count=len(tickets) - created))
+
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _handle_custom_fields(self, action_result, custom_fields):
+        """This function is used to handle the custom fields in fields parameter."""
+
+        requested_fields = []
+        for custom_field_item in custom_fields:
+            keys_list = list(custom_field_item.keys())
+            values_list = list(custom_field_item.values())
+
+            if not keys_list or len(keys_list) > 1:
+                return action_result.set_status(phantom.APP_ERROR, "Invalid value for field custom_filed"), None
+
+            requested_fields.append((keys_list[0], values_list[0]))
+
+        ret_val, ticket_field_index, from_cache = self._get_ticket_field_index(action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), None
+
+        # A title missing from the cached index may belong to a field created since, so rebuild the index once
+        if from_cache and any(key not in ticket_field_index for key, _value in requested_fields):
+            ret_val, ticket_field_index, _from_cache = self._get_ticket_field_index(action_result, refresh=True)
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+        unmatched_fields = [key for key, _value in requested_fields if key not in ticket_field_index]
+
+        if unmatched_fields:
+            return (
+                action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_CUSTOM_FIELDS_NOT_FOUND, fields=", ".join(unmatched_fields)),
+                None,
+            )
+
+        return phantom.APP_SUCCESS, [{"id": ticket_field_index[key], "value": value} for key, value in requested_fields]
+
+    def _update_ticket(self, param):
+        """Action handler for the 'update ticket' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        ret_val, ticket_ids = self._get_ticket_ids(param, action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # Parse and set the fields parameter, it is required for this action
+        ret_val, fields = self._get_fields(param, action_result)
+
+        # Process error
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        if not fields:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_EMPTY_FIELDS)
+
+        # A list holds different fields for every ticket, in the order of the IDs
+        payloads = fields if isinstance(fields, list) else [fields]
+
+        if isinstance(fields, list) and len(fields) != len(ticket_ids):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_FIELDS_COUNT)
+
+        for payload in payloads:
+            if not payload or not isinstance(payload, dict):
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_EMPTY_FIELDS)
+
+            ret_val = self._resolve_custom_fields(action_result, payload)
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status()
+
+        if len(ticket_ids) > 1:
+            return self._update_many_tickets(action_result, ticket_ids, payloads)
+
+        ret_val, endpoint = self._get_ticket_endpoint({consts.ZENDESK_JSON_TICKET_ID: ticket_ids[0]}, action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        data = {"ticket": payloads[0]}
+
+        # Make the REST CAll
+        ret_val, response = self._make_rest_call(
+            endpoint, action_result, params={"include": consts.ZENDESK_TICKET_SIDELOADS}, data=data, method="put"
+        )
+
+        # Process the error
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        self._add_sideloads(response)
+
+        # Get the result
+        ticket = response.get("ticket")
+
+        self._add_names_to_ids([ticket])
 
         # Set the summary
         action_result.set_summary({consts.ZENDESK_JSON_UPDATED_TICKET_ID: ticket["id"]})
 
-        # Add the data
-        action_result.add_data(ticket)
+        # Add the data
+        action_result.add_data(ticket)
+
+        # Set the status
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _update_many_tickets(self, action_result, ticket_ids, payloads):
+        """Updates several tickets with update_many, either with the same fields or with one payload per ticket, then
+        waits for the background jobs and adds the updated tickets to the action result"""
+
+        job_results = []
+
+        for index in range(0, len(ticket_ids), consts.ZENDESK_SHOW_MANY_LIMIT):
+            chunk = ticket_ids[index : index + consts.ZENDESK_SHOW_MANY_LIMIT]
+
+            if len(payloads) == 1:
+                params = {"ids": ",".join(chunk)}
+                data = {"ticket": payloads[0]}
+            else:
+                params = None
+                data = {"tickets": [dict(payload, id=int(ticket_id)) for ticket_id, payload in zip(chunk, payloads[index : index + len(chunk)])]}
+
+            ret_val, response = self._make_rest_call("/tickets/update_many.json", action_result, params=params, data=data, method="put")
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            ret_val, job_status = self._wait_for_job(action_result, response.get("job_status") or {})
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            job_results.extend(job_status.get("results") or [])
+
+        updated_ids = {str(result.get("id")) for result in job_results if result.get("success", result.get("status") == "Updated")}
+        updated_ticket_ids = [ticket_id for ticket_id in ticket_ids if ticket_id in updated_ids]
+        failed_ticket_ids = [ticket_id for ticket_id in ticket_ids if ticket_id not in updated_ids]
+
+        action_result.set_summary(
+            {consts.ZENDESK_JSON_UPDATED_TICKETS: len(updated_ticket_ids), consts.ZENDESK_JSON_FAILED_TICKET_IDS: failed_ticket_ids}
+        )
+
+        # The job results only hold the IDs, fetch the updated tickets so that the data matches a single update
+        ret_val, tickets = self._fetch_tickets(action_result, updated_ticket_ids)
+
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        self._add_names_to_ids(tickets)
+
+        for ticket in tickets:
+            action_result.add_data(ticket)
+
+        if failed_ticket_ids:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_UPDATE_TICKETS.format(ids=", ".join(failed_ticket_ids)))
+
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _get_many_tickets(self, action_result, ticket_ids, fields_to_return=None):
+        """Gets several tickets at once with show_many, every ticket is added as a separate data entry"""
+
+        ret_val, tickets = self._fetch_tickets(action_result, ticket_ids)
+
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        self._add_names_to_ids(tickets)
+
+        self._add_tickets(action_result, tickets, fields_to_return)
+
+        found_ids = {str(ticket["id"]) for ticket in tickets}
+
+        action_result.set_summary(
+            {
+                consts.ZENDESK_JSON_TOTAL_TICKETS: len(tickets),
+                consts.ZENDESK_JSON_MISSING_TICKET_IDS: [ticket_id for ticket_id in ticket_ids if ticket_id not in found_ids],
+            }
+        )
+
+        if not tickets:
+            return action_result.set_status(phantom.APP_ERROR, status_message="No data found")
+
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _get_ticket(self, param):
+        """Action handler for the 'get ticket' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        ret_val, ticket_ids = self._get_ticket_ids(param, action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        fields_to_return = self._get_fields_to_return(param)
+
+        if len(ticket_ids) > 1:
+            return self._get_many_tickets(action_result, ticket_ids, fields_to_return)
+
+        ret_val, endpoint = self._get_ticket_endpoint({consts.ZENDESK_JSON_TICKET_ID: ticket_ids[0]}, action_result)
+
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # Make the rest call
+        ret_val, response = self._make_rest_call(endpoint, action_result, params={"include": consts.ZENDESK_TICKET_SIDELOADS}, cache=True)
+
+        # Process the error
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            self.set_status(phantom.APP_ERROR, action_result.get_message())
+            return phantom.APP_ERROR
+
+        self._add_sideloads(response)
+
+        if not response.get("ticket"):
+            return action_result.set_status(phantom.APP_ERROR, status_message="No data found")
+
+        # Process the return result
+        ticket = response["ticket"]
+
+        self._add_names_to_ids([ticket])
+
+        # Set the summary
+        action_result.set_summary({consts.ZENDESK_JSON_GOT_TICKET_ID: ticket["id"]})
+
+        # Add the data
+        self._add_tickets(action_result, [ticket], fields_to_return)
+
+        # Set the status
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _parse_timestamp(self, value):
+        """Parses an ISO 8601 timestamp like the ones of the Zendesk API, timestamps without a timezone are taken as UTC,
+        returns None if the value is not a timestamp"""
+
+        try:
+            timestamp = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+        return timestamp
+
+    def _get_since(self, param, action_result):
+        """Validates the since parameter of the get ticket comments action, which holds either a comment ID or an ISO
+        8601 timestamp, returns the comment ID and the timestamp, both None if the parameter is empty"""
+
+        since = str(param.get(consts.ZENDESK_JSON_SINCE) or "").strip()
+
+        if not since:
+            return phantom.APP_SUCCESS, None, None
+
+        if since.isascii() and since.isdecimal():
+            return phantom.APP_SUCCESS, int(since), None
+
+        since_time = self._parse_timestamp(since)
+        if since_time is None:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_SINCE), None, None
+
+        return phantom.APP_SUCCESS, None, since_time
+
+    def _fetch_comments(self, action_result, endpoint, since_id=None, since_time=None, max_results=None):
+        """Follows the cursor pagination of the comments of a ticket from the most recent one, so that only the pages
+        holding comments newer than since_id or since_time are fetched. Without either, the pagination stops once
+        max_results comments are fetched. Returns the comments from the oldest one."""
+
+        def is_new(comment):
+            if since_id is not None:
+                return comment.get("id", 0) > since_id
+            if since_time is not None:
+                created_at = self._parse_timestamp(comment.get("created_at"))
+                return created_at is not None and created_at > since_time
+            return True
+
+        params = {"page[size]": consts.ZENDESK_COMMENTS_PAGE_SIZE, "sort": "-created_at", "include": consts.ZENDESK_COMMENT_SIDELOADS}
+        seen_pages = {(endpoint, tuple(sorted(params.items())))}
+        comments = []
+
+        next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+        while next_page:
+            ret_val, response = next_page()
+            next_page = None
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), None
+
+            self._add_sideloads(response)
+
+            page = response.get("comments", [])
+            new_comments = list(takewhile(is_new, page))
+            comments.extend(new_comments)
+
+            # The comments are sorted from the most recent one, so the first one that is not new ends the pagination
+            if len(new_comments) < len(page) or (since_id is None and since_time is None and max_results and len(comments) >= max_results):
+                break
+
+            if not response.get("meta", {}).get("has_more"):
+                break
+
+            endpoint, params = self._get_next_page_endpoint(response.get("links", {}).get("next") or "")
+
+            # The next links do not always carry the sideloads over
+            if endpoint is not None:
+                params.setdefault("include", consts.ZENDESK_COMMENT_SIDELOADS)
+
+            page = (endpoint, tuple(sorted(params.items()))) if endpoint is not None else None
+            if page is None or page in seen_pages:
+                return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_PAGINATION), None
+            seen_pages.add(page)
+
+            next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+        comments.reverse()
+
+        return phantom.APP_SUCCESS, comments
+
+    def _get_ticket_comments(self, param):
+        """Action handler for the 'get ticket comments' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        ret_val, endpoint = self._get_ticket_endpoint(param, action_result)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        ret_val, since_id, since_time = self._get_since(param, action_result)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        ret_val, max_results = self._validate_integer(action_result, param.get(consts.ZENDESK_JSON_MAX_RESULTS), consts.ZENDESK_JSON_MAX_RESULTS)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        ret_val, comments = self._fetch_comments(action_result, endpoint.replace(".json", "/comments.json"), since_id, since_time, max_results)
+
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        if max_results:
+            # After since, the oldest new comments are returned so that the next call continues from the last one,
+            # otherwise the most recent ones
+            comments = comments[:max_results] if since_id is not None or since_time is not None else comments[-max_results:]
+
+        # The authors are usually sideloaded, the others are resolved in bulk
+        self._resolve_user_names(comment.get("author_id") for comment in comments)
+
+        for comment in comments:
+            author_name = self._get_cached_user_name(comment.get("author_id"))
+            if author_name:
+                comment["author_id_name"] = author_name
+
+            action_result.add_data(comment)
+
+        # The ID of the most recent comment is the since value of the next call, it stays the same without new comments
+        latest_comment_id = comments[-1].get("id") if comments else since_id
+
+        action_result.set_summary({consts.ZENDESK_JSON_TOTAL_COMMENTS: len(comments), consts.ZENDESK_JSON_LATEST_COMMENT_ID: latest_comment_id})
 
-        # Set the status
         return action_result.set_status(phantom.APP_SUCCESS)
 
-    def _get_ticket(self, param):
-        """Action handler for the 'get ticket' action"""
+    def _upload_attachment(self, param):
+        """Action handler for the 'upload attachment' action"""
 
         # This is an action that needs to be represented by the ActionResult object
         # So create one and add it to 'self' (i.e. add it to the BaseConnector)
@@ -464,41 +2138,172 @@ class ZendeskConnector(BaseConnector):
         # Other things like the summary, data and status is set later on.
         action_result = self.add_action_result(ActionResult(dict(param)))
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
+        vault_id = param[consts.ZENDESK_JSON_VAULT_ID]
 
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
+        try:
+            success, message, vault_info = ph_rules.vault_info(vault_id=vault_id)
+            vault_info = list(vault_info or [])
+        except Exception as e:
+            success, message, vault_info = False, str(e), []
 
-        ret_val, endpoint = self._get_ticket_endpoint(param, action_result)
+        if not success or not vault_info:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_VAULT_INFO.format(vault_id=vault_id, message=message))
+
+        file_name = param.get(consts.ZENDESK_JSON_FILE_NAME) or vault_info[0].get("name") or vault_id
+
+        params = {"filename": file_name}
+
+        # Several files can be added to the same upload, so that a single comment attaches all of them
+        if param.get(consts.ZENDESK_JSON_UPLOAD_TOKEN):
+            params["token"] = param[consts.ZENDESK_JSON_UPLOAD_TOKEN]
+
+        # The file is streamed from the vault, however large it is only a block of it is in memory at a time
+        try:
+            with open(vault_info[0]["path"], "rb") as upload_file:
+                ret_val, response = self._make_rest_call("/uploads.json", action_result, params=params, method="post", upload_file=upload_file)
+        except (OSError, KeyError, TypeError) as e:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_VAULT_READ.format(error=e))
 
         if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
             return action_result.get_status()
 
-        # Make the rest call
-        ret_val, response = self._make_rest_call(endpoint, action_result)
+        upload = (response or {}).get("upload") or {}
+
+        action_result.add_data(upload)
+
+        action_result.set_summary(
+            {
+                consts.ZENDESK_JSON_UPLOAD_TOKEN: upload.get("token"),
+                consts.ZENDESK_JSON_ATTACHMENT_ID: (upload.get("attachment") or {}).get("id"),
+            }
+        )
+
+        return action_result.set_status(phantom.APP_SUCCESS)
+
+    def _is_zendesk_url(self, url):
+        """Checks that a URL points to the asset or to another Zendesk host over HTTPS, the credentials of the session
+        must not be sent anywhere else"""
+
+        base_url = urlparse(self._base_url)
+        parsed_url = urlparse(url)
+
+        if (parsed_url.scheme, parsed_url.netloc) == (base_url.scheme, base_url.netloc):
+            return True
+
+        return parsed_url.scheme == "https" and (parsed_url.hostname or "").endswith(".zendesk.com")
+
+    def _download_to_vault(self, action_result, url, file_name):
+        """Streams a file into the vault, it is written to disk in fixed size chunks as they arrive so that it is never
+        held in memory. Returns the vault ID and the number of bytes written."""
+
+        if not self._is_zendesk_url(url):
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_ATTACHMENT_URL.format(url=url)), None, 0
+
+        if not self._wait_for_request_token():
+            self._deadline_reached = True
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_DEADLINE_REACHED), None, 0
+
+        timeout = self._get_request_timeout()
+        if timeout is None:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_DEADLINE_REACHED), None, 0
+
+        received = 0
+        file_path = None
+        deadline_reached = False
+        started_at = time.perf_counter()
+
+        try:
+            with self._session.get(url, timeout=timeout, stream=True) as r:
+                self._update_rate_limit(r)
+
+                if not r.ok:
+                    return (
+                        action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_ATTACHMENT_DOWNLOAD.format(status=r.status_code)),
+                        None,
+                        0,
+                    )
+
+                fd, file_path = tempfile.mkstemp(dir=Vault.get_vault_tmp_dir())
+                with os.fdopen(fd, "wb") as vault_file:
+                    for chunk in r.iter_content(chunk_size=consts.ZENDESK_STREAM_CHUNK_SIZE):
+                        # The read timeout only bounds the wait for each chunk, the download itself stops at the deadline
+                        if self._is_past_deadline():
+                            deadline_reached = True
+                            break
+
+                        vault_file.write(chunk)
+                        received += len(chunk)
+        except Exception as e:
+            if file_path:
+                os.remove(file_path)
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_SERVER_CONNECTION, e), None, 0
+        finally:
+            self._record_request("/attachments", time.perf_counter() - started_at, received)
+
+        if deadline_reached:
+            os.remove(file_path)
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_ATTACHMENT_DEADLINE), None, 0
+
+        try:
+            success, message, vault_id = ph_rules.vault_add(container=self.get_container_id(), file_location=file_path, file_name=file_name)
+        except Exception as e:
+            success, message, vault_id = False, str(e), None
+        finally:
+            # The vault keeps its own copy of the file
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        if not success:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_VAULT_ADD.format(message=message)), None, 0
+
+        return phantom.APP_SUCCESS, vault_id, received
+
+    def _download_attachment(self, param):
+        """Action handler for the 'download attachment' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        ret_val, attachment_id = self._validate_integer(
+            action_result, param.get(consts.ZENDESK_JSON_ATTACHMENT_ID), consts.ZENDESK_JSON_ATTACHMENT_ID
+        )
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        if attachment_id is None:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_INVALID_INTEGER.format(key=consts.ZENDESK_JSON_ATTACHMENT_ID))
+
+        ret_val, response = self._make_rest_call(f"/attachments/{attachment_id}.json", action_result)
 
-        # Process the error
         if phantom.is_fail(ret_val):
             self.debug_print(action_result.get_message())
-            self.set_status(phantom.APP_ERROR, action_result.get_message())
-            return phantom.APP_ERROR
+            return action_result.get_status()
 
-        if not response.get("ticket"):
+        attachment = (response or {}).get("attachment") or {}
+
+        if not attachment.get("content_url"):
             return action_result.set_status(phantom.APP_ERROR, status_message="No data found")
 
-        # Process the return result
-        ticket = response["ticket"]
+        file_name = attachment.get("file_name") or str(attachment_id)
 
-        self._add_names_to_ids(ticket)
+        ret_val, vault_id, size = self._download_to_vault(action_result, attachment["content_url"], file_name)
 
-        # Set the summary
-        action_result.set_summary({consts.ZENDESK_JSON_GOT_TICKET_ID: ticket["id"]})
+        if phantom.is_fail(ret_val):
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
 
-        # Add the data
-        action_result.add_data(ticket)
+        attachment[consts.ZENDESK_JSON_VAULT_ID] = vault_id
+
+        action_result.add_data(attachment)
+
+        action_result.set_summary(
+            {consts.ZENDESK_JSON_VAULT_ID: vault_id, consts.ZENDESK_JSON_FILE_NAME: file_name, consts.ZENDESK_JSON_SIZE: size}
+        )
 
-        # Set the status
         return action_result.set_status(phantom.APP_SUCCESS)
 
     def _list_tickets(self, param):
@@ -510,22 +2315,37 @@ class ZendeskConnector(BaseConnector):
         # Other things like the summary, data and status is set later on.
         action_result = self.add_action_result(ActionResult(dict(param)))
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
-
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
-
         # Endpoint
         endpoint = "/tickets.json"
 
+        fields_to_return = self._get_fields_to_return(param)
+
+        if param.get(consts.ZENDESK_JSON_FETCH_ALL):
+            ret_val, per_page, max_results = self._get_pagination_params(param, action_result)
+            if phantom.is_fail(ret_val):
+                return action_result.get_status()
+
+            # Follow the cursor pagination, the tickets are added to the action result page by page
+            params = {"page[size]": per_page, "include": consts.ZENDESK_TICKET_SIDELOADS}
+
+            ret_val, total = self._add_all_pages(action_result, endpoint, params, "tickets", max_results, fields_to_return)
+
+            action_result.set_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: total})
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            return self._set_paginated_status(action_result, total)
+
         params = {
             "per_page": param.get(consts.ZENDESK_JSON_PER_PAGE, consts.DEFAULT_MAX_RESULTS),
             "page": param.get(consts.ZENDESK_JSON_PAGE, 1),
+            "include": consts.ZENDESK_TICKET_SIDELOADS,
         }
 
         # Make the rest call
-        ret_val, response = self._make_rest_call(endpoint, action_result, params=params)
+        ret_val, response = self._make_rest_call(endpoint, action_result, params=params, stream=True)
 
         # Process errors
         if phantom.is_fail(ret_val):
@@ -533,16 +2353,18 @@ class ZendeskConnector(BaseConnector):
             self.set_status(phantom.APP_ERROR, action_result.get_message())
             return phantom.APP_ERROR
 
+        self._add_sideloads(response)
+
         # Process successful response
         tickets = response["tickets"]
 
         # Set the summary
         action_result.set_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: len(tickets)})
 
+        self._add_names_to_ids(tickets)
+
         # Add each ticket as a data
-        for ticket in tickets:
-            self._add_names_to_ids(ticket)
-            action_result.add_data(ticket)
+        self._add_tickets(action_result, tickets, fields_to_return)
 
         # Set the Status
         return action_result.set_status(phantom.APP_SUCCESS)
@@ -556,12 +2378,6 @@ class ZendeskConnector(BaseConnector):
         # Other things like the summary, data and status is set later on.
         action_result = self.add_action_result(ActionResult(dict(param)))
 
-        # Progress
-        self.save_progress(consts.ZENDESK_USING_BASE_URL, base_url=self._base_url)
-
-        # Connectivity
-        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
-
         # Endpoint
         endpoint = "/search.json"
 
@@ -570,12 +2386,56 @@ class ZendeskConnector(BaseConnector):
         # Parameters, I don't think these need to be url encoded
         request_params = {"query": f"type:{query_type} {param[consts.ZENDESK_JSON_QUERY]}"}
 
+        fields_to_return = self._get_fields_to_return(param)
+
+        if param.get(consts.ZENDESK_JSON_QUERY_LOCAL):
+            ret_val, answered = self._run_local_query(param, action_result, fields_to_return)
+            if answered:
+                return ret_val
+
+            # The mirror could not be brought up to date, the query is sent to Zendesk instead
+            action_result.set_summary({consts.ZENDESK_JSON_SOURCE: consts.ZENDESK_SOURCE_ZENDESK})
+
+        if param.get(consts.ZENDESK_JSON_COUNT_ONLY):
+            # Only the number of matching tickets is requested, none of them is downloaded or enriched
+            ret_val, response = self._make_rest_call("/search/count.json", action_result, params=request_params)
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            action_result.update_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: response.get("count"), consts.ZENDESK_JSON_RETURNED_TICKETS: 0})
+
+            return action_result.set_status(phantom.APP_SUCCESS)
+
+        if param.get(consts.ZENDESK_JSON_FETCH_ALL):
+            ret_val, per_page, max_results = self._get_pagination_params(param, action_result)
+            if phantom.is_fail(ret_val):
+                return action_result.get_status()
+
+            # The search endpoint only supports offset pagination, the export one is used to follow the cursor instead
+            request_params.update({"filter[type]": query_type, "page[size]": per_page})
+
+            ret_val, total = self._add_all_pages(action_result, "/search/export.json", request_params, "results", max_results, fields_to_return)
+
+            # The export endpoint does not count the matching tickets, only the returned ones are known
+            action_result.update_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: total, consts.ZENDESK_JSON_RETURNED_TICKETS: total})
+
+            if phantom.is_fail(ret_val):
+                self.debug_print(action_result.get_message())
+                return action_result.get_status()
+
+            return self._set_paginated_status(action_result, total)
+
         request_params.update(
-            {"per_page": param.get(consts.ZENDESK_JSON_PER_PAGE, consts.DEFAULT_MAX_RESULTS), "page": param.get(consts.ZENDESK_JSON_PAGE, 1)}
+            {
+                "per_page": param.get(consts.ZENDESK_JSON_PER_PAGE, consts.DEFAULT_MAX_RESULTS),
+                "page": param.get(consts.ZENDESK_JSON_PAGE, 1),
+                "include": consts.ZENDESK_SEARCH_SIDELOADS,
+            }
         )
 
         # Make the rest call
-        ret_val, response = self._make_rest_call(endpoint, action_result, params=request_params)
+        ret_val, response = self._make_rest_call(endpoint, action_result, params=request_params, stream=True)
 
         # Process errors
         if phantom.is_fail(ret_val):
@@ -583,20 +2443,419 @@ class ZendeskConnector(BaseConnector):
             self.set_status(phantom.APP_ERROR, action_result.get_message())
             return phantom.APP_ERROR
 
+        self._add_sideloads(response)
+
         # Process successfully response
         tickets = response.get("results", [])
 
         # Set the summary
-        action_result.set_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: response.get("count"), consts.ZENDESK_JSON_RETURNED_TICKETS: len(tickets)})
+        action_result.update_summary(
+            {consts.ZENDESK_JSON_TOTAL_TICKETS: response.get("count"), consts.ZENDESK_JSON_RETURNED_TICKETS: len(tickets)}
+        )
 
-        for ticket in tickets:
-            self._add_names_to_ids(ticket)
-            # Add as data to the action result
-            action_result.add_data(ticket)
+        self._add_names_to_ids(tickets)
+
+        # Add as data to the action result
+        self._add_tickets(action_result, tickets, fields_to_return)
 
         # Set the Status
         return action_result.set_status(phantom.APP_SUCCESS)
 
+    def _parse_query_time(self, value):
+        """Parses the value of an updated filter, a date, a timestamp or a time relative to now like 2days, returns the
+        start and the end of the period it stands for, in the format of the Zendesk timestamps"""
+
+        match = re.fullmatch(r"([0-9]+)(minute|hour|day|week)s?", value.lower())
+        if match:
+            start = end = datetime.now(timezone.utc) - timedelta(**{f"{match.group(2)}s": int(match.group(1))})
+        else:
+            start = end = self._parse_timestamp(value)
+            if start is None:
+                return None, None
+
+            # A date stands for the whole day
+            if len(value) == len("YYYY-MM-DD"):
+                end = start + timedelta(days=1)
+
+        return start.strftime("%Y-%m-%dT%H:%M:%SZ"), end.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _parse_local_query(self, query):
+        """Translates a Zendesk search query into the conditions of a query on the local mirror, returns None if the
+        query holds anything else than status, priority, requester, tags and updated filters. Like on Zendesk, the
+        values of a repeated filter are alternatives."""
+
+        conditions = {}
+
+        for term in query.split():
+            match = re.fullmatch(r"(type|status|priority|requester|tags|updated)(<=|>=|:|<|>)(.+)", term, re.IGNORECASE)
+            if not match:
+                return None
+
+            key, operator, value = match.group(1).lower(), match.group(2), match.group(3).strip('"')
+
+            if key == "type":
+                if operator != ":" or value.lower() != "ticket":
+                    return None
+                continue
+
+            if key in ("status", "priority"):
+                # The statuses and the priorities are ordered, e.g. status<solved stands for the unsolved tickets
+                order = consts.ZENDESK_STATUS_ORDER if key == "status" else consts.ZENDESK_PRIORITY_ORDER
+                if value.lower() not in order:
+                    return None
+                rank = order.index(value.lower())
+                compare = {":": rank.__eq__, "<": rank.__gt__, ">": rank.__lt__, "<=": rank.__ge__, ">=": rank.__le__}[operator]
+                values = [name for index, name in enumerate(order) if compare(index)]
+                condition = (f"{key} IN ({','.join('?' * len(values))})", values)
+            elif key == "requester":
+                if operator != ":" or not value.isdecimal():
+                    return None
+                condition = ("requester_id = ?", [int(value)])
+            elif key == "tags":
+                if operator != ":":
+                    return None
+                condition = ("id IN (SELECT ticket_id FROM ticket_tags WHERE tag = ?)", [value])
+            else:
+                start, end = self._parse_query_time(value)
+                if start is None:
+                    return None
+                condition = {
+                    ":": ("updated_at >= ? AND updated_at < ?", [start, end]),
+                    "<": ("updated_at < ?", [start]),
+                    ">=": ("updated_at >= ?", [start]),
+                    ">": ("updated_at >= ?", [end]) if end != start else ("updated_at > ?", [end]),
+                    "<=": ("updated_at < ?", [end]) if end != start else ("updated_at <= ?", [end]),
+                }[operator]
+
+            conditions.setdefault(key, []).append(condition)
+
+        clauses = []
+        args = []
+        for alternatives in conditions.values():
+            clauses.append("(" + " OR ".join(f"({clause})" for clause, _args in alternatives) + ")")
+            args.extend(arg for _clause, alternative_args in alternatives for arg in alternative_args)
+
+        return " AND ".join(clauses) or "1", args
+
+    def _open_mirror(self):
+        """Opens the local mirror of the tickets in the state directory, its tables are created on first use"""
+
+        if self._mirror is None:
+            self._mirror = sqlite3.connect(self._mirror_file, timeout=consts.ZENDESK_MIRROR_LOCK_TIMEOUT)
+            self._mirror.executescript(consts.ZENDESK_MIRROR_SCHEMA)
+
+        return self._mirror
+
+    def _store_in_mirror(self, mirror, tickets):
+        """Writes a page of the incremental export into the mirror, the deleted tickets are removed from it"""
+
+        # The page is written in a single transaction
+        with mirror:
+            for ticket in tickets:
+                mirror.execute("DELETE FROM ticket_tags WHERE ticket_id = ?", (ticket["id"],))
+
+                if ticket.get("status") == "deleted":
+                    mirror.execute("DELETE FROM tickets WHERE id = ?", (ticket["id"],))
+                    continue
+
+                mirror.execute(
+                    "INSERT OR REPLACE INTO tickets (id, status, priority, requester_id, updated_at, ticket) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        ticket["id"],
+                        ticket.get("status"),
+                        ticket.get("priority"),
+                        ticket.get("requester_id"),
+                        ticket.get("updated_at"),
+                        json.dumps(ticket),
+                    ),
+                )
+                mirror.executemany(
+                    "INSERT OR IGNORE INTO ticket_tags (tag, ticket_id) VALUES (?, ?)", [(tag, ticket["id"]) for tag in ticket.get("tags") or []]
+                )
+
+        return phantom.APP_SUCCESS
+
+    def _sync_mirror(self):
+        """Brings the local mirror up to date from the incremental export, unless it was synced less than
+        local_mirror_max_age seconds ago. At most ZENDESK_MIRROR_SYNC_MAX_TICKETS tickets are fetched, so that an
+        action does not spend its time building a large mirror. Returns whether the mirror is up to date."""
+
+        mirror = self._open_mirror()
+        mirror_state = dict(mirror.execute("SELECT key, value FROM mirror_state").fetchall())
+
+        if time.time() - float(mirror_state.get("synced_at") or 0) <= self._mirror_max_age:
+            return True
+
+        started_at = time.time()
+
+        # The sync has its own result, a failure only means the query is sent to Zendesk instead
+        sync_ar = ActionResult()
+
+        ret_val, cursor, end_of_stream, total = self._follow_ticket_export(
+            sync_ar,
+            mirror_state.get("cursor"),
+            0,
+            consts.ZENDESK_MIRROR_SYNC_MAX_TICKETS,
+            lambda tickets: self._store_in_mirror(mirror, tickets),
+            per_page=consts.ZENDESK_EXPORT_MAX_PER_PAGE,
+        )
+
+        if phantom.is_fail(ret_val):
+            self.debug_print(sync_ar.get_message())
+
+        self.debug_print(f"Stored {total} tickets in the local mirror, end of stream: {end_of_stream}")
+
+        # The cursor of the last stored page is kept even if the sync did not complete, the next one continues from it
+        with mirror:
+            if cursor:
+                mirror.execute("INSERT OR REPLACE INTO mirror_state (key, value) VALUES ('cursor', ?)", (cursor,))
+            if not phantom.is_fail(ret_val) and end_of_stream:
+                mirror.execute("INSERT OR REPLACE INTO mirror_state (key, value) VALUES ('synced_at', ?)", (str(started_at),))
+
+        return not phantom.is_fail(ret_val) and end_of_stream
+
+    def _run_local_query(self, param, action_result, fields_to_return):
+        """Answers a run query action from the local mirror, once it is up to date. Returns the status and whether the
+        query was answered, it is not if the mirror could not be brought up to date."""
+
+        query = self._parse_local_query(param[consts.ZENDESK_JSON_QUERY])
+        if query is None:
+            return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_LOCAL_QUERY), True
+
+        ret_val, per_page, max_results = self._get_pagination_params(param, action_result)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), True
+
+        ret_val, page = self._validate_integer(action_result, param.get(consts.ZENDESK_JSON_PAGE, 1), consts.ZENDESK_JSON_PAGE)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status(), True
+
+        where, args = query
+
+        if param.get(consts.ZENDESK_JSON_COUNT_ONLY):
+            limit, offset = 0, 0
+        elif param.get(consts.ZENDESK_JSON_FETCH_ALL):
+            limit, offset = max_results or -1, 0
+        else:
+            limit, offset = per_page, (page - 1) * per_page
+
+        try:
+            if not self._sync_mirror():
+                return action_result.get_status(), False
+
+            mirror = self._open_mirror()
+            (count,) = mirror.execute(f"SELECT COUNT(*) FROM tickets WHERE {where}", args).fetchone()  # nosemgrep
+            rows = mirror.execute(
+                f"SELECT ticket FROM tickets WHERE {where} ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?",  # nosemgrep
+                [*args, limit, offset],
+            )
+
+            # The tickets are stored along with the names resolved when they were exported
+            returned = 0
+            for (ticket,) in rows:
+                self._add_tickets(action_result, [json.loads(ticket)], fields_to_return)
+                returned += 1
+        except sqlite3.Error as e:
+            self.debug_print(f"Unable to use the local mirror: {e}")
+            return action_result.get_status(), False
+
+        action_result.set_summary(
+            {
+                consts.ZENDESK_JSON_TOTAL_TICKETS: count,
+                consts.ZENDESK_JSON_RETURNED_TICKETS: returned,
+                consts.ZENDESK_JSON_SOURCE: consts.ZENDESK_SOURCE_LOCAL_MIRROR,
+            }
+        )
+
+        return action_result.set_status(phantom.APP_SUCCESS), True
+
+    def _follow_ticket_export(self, action_result, cursor, start_time, max_results, handle_page, per_page=None):
+        """Follows the incremental ticket export from the cursor, or from start_time if there is no cursor, the enriched
+        tickets of every page are passed to handle_page as soon as the page arrives. The cap is checked per page, since
+        stopping in the middle of a page would skip its remaining tickets."""
+
+        endpoint = "/incremental/tickets/cursor.json"
+        params = {"cursor": cursor} if cursor else {"start_time": start_time}
+        params["include"] = consts.ZENDESK_TICKET_SIDELOADS
+
+        if per_page:
+            params["per_page"] = per_page
+
+        total = 0
+        end_of_stream = False
+
+        next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+        while next_page:
+            ret_val, response = next_page()
+            next_page = None
+
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), cursor, False, total
+
+            self._add_sideloads(response)
+
+            tickets = response.get("tickets", [])
+
+            next_cursor = response.get("after_cursor") or cursor
+            end_of_stream = response.get("end_of_stream", True) or not response.get("after_cursor")
+
+            # The next page is requested before this one is handled, so that it can be fetched meanwhile. The cursor of
+            # the last handled page is returned, so stopping at the deadline does not skip any ticket.
+            if not (end_of_stream or (max_results and total + len(tickets) >= max_results) or self._is_past_deadline()):
+                params = {"cursor": next_cursor, "include": consts.ZENDESK_TICKET_SIDELOADS}
+
+                if per_page:
+                    params["per_page"] = per_page
+
+                next_page = self._submit(self._make_rest_call, endpoint, action_result, params=params, stream=True)
+
+            self._add_names_to_ids(tickets)
+
+            ret_val = handle_page(tickets)
+            if phantom.is_fail(ret_val):
+                return action_result.get_status(), cursor, False, total
+
+            total += len(tickets)
+            cursor = next_cursor
+
+        return phantom.APP_SUCCESS, cursor, end_of_stream, total
+
+    def _export_tickets(self, param):
+        """Action handler for the 'export tickets' action"""
+
+        # This is an action that needs to be represented by the ActionResult object
+        # So create one and add it to 'self' (i.e. add it to the BaseConnector)
+        # When the action_result is created this way, the parameter is also passed.
+        # Other things like the summary, data and status is set later on.
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        ret_val, start_time = self._validate_integer(
+            action_result, param.get(consts.ZENDESK_JSON_START_TIME, 0), consts.ZENDESK_JSON_START_TIME, True
+        )
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        ret_val, max_results = self._validate_integer(action_result, param.get(consts.ZENDESK_JSON_MAX_RESULTS), consts.ZENDESK_JSON_MAX_RESULTS)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # Continue from where the previous export stopped, unless asked to start over
+        cursor = None if param.get(consts.ZENDESK_JSON_RESET_CURSOR) else self._state.get(consts.ZENDESK_STATE_EXPORT_CURSOR)
+
+        fields_to_return = self._get_fields_to_return(param)
+
+        def add_page(tickets):
+            self._add_tickets(action_result, tickets, fields_to_return)
+            return phantom.APP_SUCCESS
+
+        ret_val, cursor, end_of_stream, total = self._follow_ticket_export(action_result, cursor, start_time, max_results, add_page)
+
+        action_result.set_summary({consts.ZENDESK_JSON_TOTAL_TICKETS: total, consts.ZENDESK_JSON_END_OF_STREAM: end_of_stream})
+
+        if phantom.is_fail(ret_val):
+            # The saved cursor is left untouched, so the next export fetches the tickets of this one again
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        if cursor:
+            self._state[consts.ZENDESK_STATE_EXPORT_CURSOR] = cursor
+
+        return self._set_paginated_status(action_result, total)
+
+    def _ticket_to_container(self, ticket):
+        """Maps a ticket to a container holding a single artifact, the artifact is identified by the ticket id and its
+        update time, so that every update of the ticket is ingested once"""
+
+        ticket_id = ticket["id"]
+
+        artifact = {
+            "name": "Ticket Artifact",
+            "label": "ticket",
+            "source_data_identifier": f"{ticket_id}_{ticket.get('updated_at')}",
+            "cef": {key: ticket[key] for key in consts.ZENDESK_TICKET_CEF_FIELDS if ticket.get(key) is not None},
+            "cef_types": {"id": ["zendesk ticket id"], "url": ["url"]},
+            "severity": consts.ZENDESK_PRIORITY_TO_SEVERITY.get(ticket.get("priority"), "medium"),
+            "run_automation": True,
+        }
+
+        return {
+            "name": f"Zendesk ticket {ticket_id}: {ticket.get('subject') or ''}".strip(),
+            "description": ticket.get("description"),
+            "source_data_identifier": str(ticket_id),
+            "severity": artifact["severity"],
+            "artifacts": [artifact],
+        }
+
+    def _on_poll(self, param):
+        """Action handler for the 'on poll' action, ingests the tickets changed since the previous poll"""
+
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        config = self.get_config()
+
+        poll_now = self.is_poll_now()
+
+        # Poll now only ingests a sample of the tickets, it neither limits nor moves the checkpoint of the scheduled polls
+        if poll_now:
+            max_tickets = param.get(consts.ZENDESK_JSON_CONTAINER_COUNT, consts.ZENDESK_DEFAULT_POLL_MAX_TICKETS)
+            key = consts.ZENDESK_JSON_CONTAINER_COUNT
+        else:
+            max_tickets = config.get(consts.ZENDESK_JSON_POLL_MAX_TICKETS, consts.ZENDESK_DEFAULT_POLL_MAX_TICKETS)
+            key = consts.ZENDESK_JSON_POLL_MAX_TICKETS
+
+        ret_val, max_tickets = self._validate_integer(action_result, max_tickets, key)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        # The incremental export rejects a start time less than a minute in the past, so zero days are rejected as well
+        ret_val, first_run_days = self._validate_integer(
+            action_result,
+            config.get(consts.ZENDESK_JSON_POLL_FIRST_RUN_DAYS, consts.ZENDESK_DEFAULT_POLL_FIRST_RUN_DAYS),
+            consts.ZENDESK_JSON_POLL_FIRST_RUN_DAYS,
+        )
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        cursor = self._state.get(consts.ZENDESK_STATE_POLL_CURSOR)
+        start_time = int(time.time()) - first_run_days * 86400
+
+        # The export can return the same ticket version twice across pages, only ingest it once
+        seen_tickets = set()
+
+        def ingest_page(tickets):
+            containers = []
+            for ticket in tickets:
+                ticket_key = (ticket["id"], ticket.get("updated_at"))
+                if ticket_key in seen_tickets:
+                    continue
+                seen_tickets.add(ticket_key)
+                containers.append(self._ticket_to_container(ticket))
+
+            for index in range(0, len(containers), consts.ZENDESK_CONTAINER_BATCH_SIZE):
+                ret_val, message, _responses = self.save_containers(containers[index : index + consts.ZENDESK_CONTAINER_BATCH_SIZE])
+                if phantom.is_fail(ret_val):
+                    return action_result.set_status(phantom.APP_ERROR, consts.ZENDESK_ERR_SAVE_CONTAINERS.format(message=message))
+
+            self.save_progress(consts.ZENDESK_MSG_INGESTED_TICKETS.format(count=len(seen_tickets)))
+
+            return phantom.APP_SUCCESS
+
+        # Asking for pages no bigger than the limit keeps the work of a cycle close to it, pages are always ingested whole
+        ret_val, cursor, _end_of_stream, total = self._follow_ticket_export(
+            action_result, cursor, start_time, max_tickets, ingest_page, per_page=min(max_tickets, consts.ZENDESK_EXPORT_MAX_PER_PAGE)
+        )
+
+        if phantom.is_fail(ret_val):
+            # The checkpoint is not moved, the next poll ingests the same tickets again, duplicates are merged by the platform
+            self.debug_print(action_result.get_message())
+            return action_result.get_status()
+
+        if cursor and not poll_now:
+            self._state[consts.ZENDESK_STATE_POLL_CURSOR] = cursor
+
+        return self._set_paginated_status(action_result, total)
+
     def handle_action(self, param):
         """Function that handles all the actions"""
 
@@ -606,20 +2865,38 @@ class ZendeskConnector(BaseConnector):
         # Initialize it to success
         ret_val = phantom.APP_SUCCESS
 
+        # Connectivity, reported once here rather than by every handler
+        self.debug_print(consts.ZENDESK_USING_BASE_URL.format(base_url=self._base_url))
+        self.save_progress(phantom.APP_PROG_CONNECTING_TO_ELLIPSES, self._host)
+
         # Bunch if..elif to process actions
         if action == self.ACTION_ID_CREATE_TICKET:
-            ret_val = self._create_ticket(param)
+            ret_val = self._run_invalidating(self._create_ticket, param)
+        elif action == self.ACTION_ID_CREATE_TICKETS:
+            ret_val = self._run_invalidating(self._create_tickets, param)
         elif action == self.ACTION_ID_LIST_TICKETS:
-            ret_val = self._list_tickets(param)
+            ret_val = self._run_cached(self._list_tickets, param)
         elif action == self.ACTION_ID_GET_TICKET:
             ret_val = self._get_ticket(param)
         elif action == self.ACTION_ID_UPDATE_TICKET:
-            ret_val = self._update_ticket(param)
+            ret_val = self._run_invalidating(self._update_ticket, param)
         elif action == self.ACTION_ID_RUN_QUERY:
-            ret_val = self._run_query(param)
+            ret_val = self._run_cached(self._run_query, param)
+        elif action == self.ACTION_ID_GET_TICKET_COMMENTS:
+            ret_val = self._get_ticket_comments(param)
+        elif action == self.ACTION_ID_UPLOAD_ATTACHMENT:
+            ret_val = self._upload_attachment(param)
+        elif action == self.ACTION_ID_DOWNLOAD_ATTACHMENT:
+            ret_val = self._download_attachment(param)
+        elif action == self.ACTION_ID_EXPORT_TICKETS:
+            ret_val = self._export_tickets(param)
+        elif action == phantom.ACTION_ID_INGEST_ON_POLL:
+            ret_val = self._on_poll(param)
         elif action == phantom.ACTION_ID_TEST_ASSET_CONNECTIVITY:
             ret_val = self._test_connectivity(param)
 
+        self._add_metrics_to_summary()
+
         return ret_val
 
 
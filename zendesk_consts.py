@@ -28,6 +28,64 @@ ZENDESK_JSON_QUERY = "query"
 ZENDESK_JSON_API_TOKEN = "api_token"
 ZENDESK_JSON_PER_PAGE = "max_results_per_page"
 ZENDESK_JSON_PAGE = "page_number"
+ZENDESK_JSON_FETCH_ALL = "fetch_all"
+ZENDESK_JSON_START_TIME = "start_time"
+ZENDESK_JSON_RESET_CURSOR = "reset_cursor"
+ZENDESK_JSON_END_OF_STREAM = "end_of_stream"
+ZENDESK_JSON_CONTAINER_COUNT = "container_count"
+ZENDESK_JSON_POLL_MAX_TICKETS = "poll_max_tickets"
+ZENDESK_JSON_POLL_FIRST_RUN_DAYS = "poll_first_run_days"
+ZENDESK_JSON_UPDATED_TICKETS = "updated_tickets"
+ZENDESK_JSON_FAILED_TICKET_IDS = "failed_ticket_ids"
+ZENDESK_JSON_MISSING_TICKET_IDS = "missing_ticket_ids"
+ZENDESK_JSON_TICKETS = "tickets"
+ZENDESK_JSON_CREATED_TICKETS = "created_tickets"
+ZENDESK_JSON_FAILED_TICKETS = "failed_tickets"
+ZENDESK_JSON_USER_CACHE_TTL = "user_cache_ttl"
+ZENDESK_JSON_USER_CACHE_MAX_ENTRIES = "user_cache_max_entries"
+ZENDESK_JSON_TICKET_FIELDS_CACHE_TTL = "ticket_fields_cache_ttl"
+ZENDESK_JSON_RETRY_BUDGET = "retry_budget"
+ZENDESK_JSON_REQUESTS_PER_MINUTE = "requests_per_minute"
+ZENDESK_JSON_CONNECT_TIMEOUT = "connect_timeout"
+ZENDESK_JSON_READ_TIMEOUT = "read_timeout"
+ZENDESK_JSON_ACTION_DEADLINE = "action_deadline"
+ZENDESK_JSON_METRICS = "metrics"
+ZENDESK_JSON_FIELDS_TO_RETURN = "fields_to_return"
+ZENDESK_JSON_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+ZENDESK_JSON_DEFAULT_FIELDS_TO_RETURN = "default_fields_to_return"
+ZENDESK_JSON_RESPONSE_CACHE_SIZE = "response_cache_size"
+ZENDESK_JSON_SINCE = "since"
+ZENDESK_JSON_TOTAL_COMMENTS = "total_comments"
+ZENDESK_JSON_LATEST_COMMENT_ID = "latest_comment_id"
+ZENDESK_JSON_VAULT_ID = "vault_id"
+ZENDESK_JSON_FILE_NAME = "file_name"
+ZENDESK_JSON_UPLOAD_TOKEN = "upload_token"
+ZENDESK_JSON_ATTACHMENT_ID = "attachment_id"
+ZENDESK_JSON_SIZE = "size"
+ZENDESK_JSON_QUERY_LOCAL = "query_local"
+ZENDESK_JSON_LOCAL_MIRROR_MAX_AGE = "local_mirror_max_age"
+ZENDESK_JSON_SOURCE = "source"
+ZENDESK_JSON_RESULT_CACHE_TTL = "result_cache_ttl"
+ZENDESK_JSON_BYPASS_CACHE = "bypass_cache"
+ZENDESK_JSON_COUNT_ONLY = "count_only"
+
+ZENDESK_METRIC_REQUESTS = "requests"
+ZENDESK_METRIC_REQUEST_TIME = "request_time"
+ZENDESK_METRIC_RETRIES = "retries"
+ZENDESK_METRIC_BYTES_RECEIVED = "bytes_received"
+ZENDESK_METRIC_RATE_LIMIT_REMAINING = "rate_limit_remaining"
+ZENDESK_METRIC_USER_CACHE_HITS = "user_cache_hits"
+ZENDESK_METRIC_USER_CACHE_MISSES = "user_cache_misses"
+ZENDESK_METRIC_TICKET_FIELDS_CACHE_HITS = "ticket_fields_cache_hits"
+ZENDESK_METRIC_TICKET_FIELDS_CACHE_MISSES = "ticket_fields_cache_misses"
+ZENDESK_METRIC_RESPONSE_CACHE_HITS = "response_cache_hits"
+ZENDESK_METRIC_RESPONSE_CACHE_MISSES = "response_cache_misses"
+ZENDESK_METRIC_ENDPOINTS = "endpoints"
+
+ZENDESK_STATE_USER_NAMES = "user_names"
+ZENDESK_STATE_TICKET_FIELDS = "ticket_fields"
+ZENDESK_STATE_EXPORT_CURSOR = "export_cursor"
+ZENDESK_STATE_POLL_CURSOR = "poll_cursor"
 
 ZENDESK_ERR_API_INITIALIZATION = "API Initialization failed"
 ZENDESK_ERR_CONNECTIVITY_TEST = "Connectivity test failed"
@@ -43,12 +101,137 @@ ZENDESK_ERR_API_UNSUPPORTED_METHOD = "Unsupported method"
 ZENDESK_ERR_EMPTY_FIELDS = "The fields dictionary was detected to be empty"
 ZENDESK_ERR_INVALID_TICKET_ID = "Please provide a positive numeric ticket ID"
 ZENDESK_ERR_TICKET_FIELDS_PAGINATION = "Unable to safely retrieve the complete ticket field catalog"
+ZENDESK_ERR_PAGINATION = "Unable to safely retrieve the next page of results"
 ZENDESK_ERR_CUSTOM_FIELDS_NOT_FOUND = "Unable to resolve ticket custom field title(s): {fields}"
 ZENDESK_EMPTY_RESPONSE_STATUS_CODES = [201, 204]
 ZENDESK_REQUEST_METHODS = ["put", "post"]
+ZENDESK_REQUEST_HEADERS = {"Content-Type": "application/json"}
+ZENDESK_UPLOAD_HEADERS = {"Content-Type": "application/binary"}
+ZENDESK_IDEMPOTENT_METHODS = ["get"]
+ZENDESK_RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
 ZENDESK_CREATED_TICKET = "Created ticket"
 ZENDESK_USING_BASE_URL = "Using url: {base_url}"
 ZENDESK_ERR_JSON_PARSE = "Unable to parse reply as a Json, raw string reply: '{raw_text}'"
+ZENDESK_ERR_FIELDS_COUNT = "The fields list must hold one dictionary per ticket ID"
+ZENDESK_ERR_UPDATE_TICKETS = "Unable to update the ticket(s): {ids}"
+ZENDESK_ERR_TICKETS_JSON_PARSE = "Unable to parse the tickets parameter into a list of dictionaries with a subject and a description"
+ZENDESK_ERR_CREATE_TICKETS = "Unable to create {count} ticket(s)"
+ZENDESK_MSG_CREATED_TICKETS = "Created {count} of {total} tickets"
+ZENDESK_ERR_JOB_NOT_COMPLETED = "The Zendesk background job {id} did not complete, status: {status}"
+ZENDESK_ERR_SAVE_CONTAINERS = "Unable to save the ingested tickets, Error: {message}"
+ZENDESK_MSG_INGESTED_TICKETS = "Ingested {count} tickets"
+ZENDESK_MSG_REQUESTS_MADE = "Made {count} request(s) to Zendesk"
+ZENDESK_ERR_DEADLINE_REACHED = "The action deadline was reached before the request could be made"
+ZENDESK_MSG_DEADLINE_PARTIAL_RESULTS = "The action deadline was reached, returning the {count} tickets retrieved so far"
+ZENDESK_ERR_MAX_CONCURRENT_REQUESTS = "Please provide a 'max_concurrent_requests' value of at most {max}"
+ZENDESK_ERR_INVALID_SINCE = "Please provide a comment ID or an ISO 8601 timestamp in the 'since' parameter"
+ZENDESK_ERR_VAULT_INFO = "Unable to find the file with vault ID {vault_id}: {message}"
+ZENDESK_ERR_VAULT_READ = "Unable to read the vault file: {error}"
+ZENDESK_ERR_VAULT_ADD = "Unable to add the attachment to the vault: {message}"
+ZENDESK_ERR_ATTACHMENT_URL = "The content URL of the attachment does not point to Zendesk: {url}"
+ZENDESK_ERR_ATTACHMENT_DOWNLOAD = "Unable to download the attachment, Status code: {status}"
+ZENDESK_ERR_ATTACHMENT_DEADLINE = "The action deadline was reached before the attachment was downloaded"
+ZENDESK_ERR_LOCAL_QUERY = (
+    "Unable to query the local mirror, the query can only hold status, priority, requester (ID), tags and updated filters, "
+    "e.g. status<solved priority:high requester:123 tags:phishing updated>2days"
+)
+ZENDESK_ERR_INVALID_INTEGER = "Please provide a valid non-negative integer value in the '{key}' parameter"
 
 DEFAULT_MAX_RESULTS = 100
+ZENDESK_SHOW_MANY_LIMIT = 100
+ZENDESK_TICKET_SIDELOADS = "users,groups,organizations"
+ZENDESK_SEARCH_SIDELOADS = "tickets(users,groups,organizations)"
+ZENDESK_COMMENT_SIDELOADS = "users"
+ZENDESK_COMMENTS_PAGE_SIZE = 100
+ZENDESK_SESSION_POOL_SIZE = 10
+ZENDESK_DEFAULT_MAX_CONCURRENT_REQUESTS = 1
+ZENDESK_STREAM_CHUNK_SIZE = 65536
+ZENDESK_PROGRESS_INTERVAL = 1
+ZENDESK_ERR_MAX_DETAIL_LENGTH = 500
+ZENDESK_DEFAULT_USER_CACHE_TTL = 86400
+ZENDESK_DEFAULT_USER_CACHE_MAX_ENTRIES = 1000
+ZENDESK_DEFAULT_TICKET_FIELDS_CACHE_TTL = 3600
+ZENDESK_DEFAULT_RESPONSE_CACHE_SIZE = 5120
+ZENDESK_DEFAULT_RETRY_BUDGET = 5
+ZENDESK_RETRY_BASE_DELAY = 1
+ZENDESK_RETRY_MAX_DELAY = 60
+ZENDESK_DEFAULT_REQUESTS_PER_MINUTE = 0
+ZENDESK_RATE_LIMIT_BURST_SECONDS = 10
+ZENDESK_DEFAULT_CONNECT_TIMEOUT = 10
+ZENDESK_DEFAULT_READ_TIMEOUT = 60
+ZENDESK_DEFAULT_ACTION_DEADLINE = 600
 ZENDESK_TICKET_FOOTNOTE = "Added by Phantom for container id: "
+ZENDESK_DEFAULT_POLL_MAX_TICKETS = 1000
+ZENDESK_DEFAULT_POLL_FIRST_RUN_DAYS = 1
+ZENDESK_EXPORT_MAX_PER_PAGE = 1000
+ZENDESK_DEFAULT_LOCAL_MIRROR_MAX_AGE = 300
+ZENDESK_MIRROR_SYNC_MAX_TICKETS = 10000
+ZENDESK_MIRROR_LOCK_TIMEOUT = 30
+ZENDESK_DEFAULT_RESULT_CACHE_TTL = 0
+ZENDESK_RESULT_CACHE_MAX_SIZE = 5120
+# The parameters the results of the list tickets and run query actions depend on, besides the returned fields
+ZENDESK_RESULT_CACHE_KEY_PARAMS = [
+    ZENDESK_JSON_QUERY,
+    ZENDESK_JSON_QUERY_LOCAL,
+    ZENDESK_JSON_COUNT_ONLY,
+    ZENDESK_JSON_PER_PAGE,
+    ZENDESK_JSON_PAGE,
+    ZENDESK_JSON_FETCH_ALL,
+    ZENDESK_JSON_MAX_RESULTS,
+]
+ZENDESK_SOURCE_LOCAL_MIRROR = "local mirror"
+ZENDESK_SOURCE_ZENDESK = "zendesk"
+ZENDESK_STATUS_ORDER = ["new", "open", "pending", "hold", "solved", "closed"]
+ZENDESK_PRIORITY_ORDER = ["low", "normal", "high", "urgent"]
+ZENDESK_MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    status TEXT,
+    priority TEXT,
+    requester_id INTEGER,
+    updated_at TEXT,
+    ticket TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tickets_status ON tickets (status, updated_at);
+CREATE INDEX IF NOT EXISTS tickets_priority ON tickets (priority, updated_at);
+CREATE INDEX IF NOT EXISTS tickets_requester ON tickets (requester_id, updated_at);
+CREATE INDEX IF NOT EXISTS tickets_updated ON tickets (updated_at);
+CREATE TABLE IF NOT EXISTS ticket_tags (
+    tag TEXT NOT NULL,
+    ticket_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, ticket_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ticket_tags_ticket ON ticket_tags (ticket_id);
+CREATE TABLE IF NOT EXISTS mirror_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+ZENDESK_CONTAINER_BATCH_SIZE = 100
+ZENDESK_CREATE_MANY_LIMIT = 100
+ZENDESK_JOB_POLL_INTERVAL = 1
+ZENDESK_JOB_POLL_MAX_INTERVAL = 10
+ZENDESK_JOB_POLL_TIMEOUT = 300
+ZENDESK_JOB_DONE_STATUSES = ["completed", "failed", "killed"]
+ZENDESK_TICKET_CEF_FIELDS = [
+    "id",
+    "url",
+    "subject",
+    "status",
+    "priority",
+    "type",
+    "tags",
+    "requester_id",
+    "requester_id_name",
+    "submitter_id",
+    "submitter_id_name",
+    "assignee_id",
+    "assignee_id_name",
+    "group_id",
+    "group_id_name",
+    "organization_id",
+    "organization_id_name",
+    "created_at",
+    "updated_at",
+]
+ZENDESK_PRIORITY_TO_SEVERITY = {"urgent": "high", "high": "high", "normal": "medium", "low": "low"}